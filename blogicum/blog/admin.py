@@ -1,6 +1,10 @@
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
 
+from .forms import PostAdminForm
 from .models import Category, Comment, Location, Post
+from .scheduler import get_publication_moment, publication_scheduler
 
 
 @admin.register(Location)
@@ -35,6 +39,40 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('category',)
     list_display_links = ('title',)
+    change_list_template = 'admin/blog/post/change_list.html'
+    form = PostAdminForm
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        return type(form.__name__, (form,), {
+            'upload_errors': getattr(request, 'upload_errors', {})
+        })
+
+    def get_urls(self):
+        return [
+            path(
+                'schedule/',
+                self.admin_site.admin_view(self.schedule_view),
+                name='blog_post_schedule',
+            ),
+        ] + super().get_urls()
+
+    def schedule_view(self, request):
+        """Отложенные публикации и моменты их появления в лентах."""
+        posts = publication_scheduler.get_upcoming()
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Расписание публикаций',
+            'next_at': publication_scheduler.get_next_at(),
+            'schedule': [
+                (get_publication_moment(post.pub_date), post)
+                for post in posts
+            ],
+        }
+        return TemplateResponse(
+            request, 'admin/blog/post/schedule.html', context
+        )
 
 
 @admin.register(Category)
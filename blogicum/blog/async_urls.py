@@ -0,0 +1,23 @@
+from django.urls import path
+
+from . import async_views, urls
+from .routers import replica_view
+
+
+app_name = urls.app_name
+
+ASYNC_VIEWS = {
+    'index': replica_view(async_views.index),
+    'post_detail': replica_view(async_views.post_detail),
+    'category_posts': replica_view(async_views.category_posts),
+    'profile': replica_view(async_views.profile),
+}
+
+urlpatterns = [
+    path(
+        str(pattern.pattern),
+        ASYNC_VIEWS.get(pattern.name, pattern.callback),
+        name=pattern.name
+    )
+    for pattern in urls.urlpatterns
+]
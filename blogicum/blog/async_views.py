@@ -0,0 +1,193 @@
+"""Асинхронные версии читающих представлений блога.
+
+ORM Django 3.2 синхронная, поэтому каждый запрос к БД выполняется
+в отдельном потоке со своим соединением, а независимые запросы
+(например, категория и страница ленты) — одновременно. Ленты
+пагинируются теми же миксинами, что и синхронные.
+"""
+from asyncio import gather
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import Http404, HttpResponseNotAllowed
+from django.shortcuts import render
+
+from .cache import feed_page_cache
+from .common import (
+    filter_objects_published,
+    filter_post_visible,
+    get_comments_page,
+    get_feed_objects,
+    get_objects_related
+)
+from .forms import CommentForm
+from .mixins import (
+    get_conditional_response_for,
+    get_feed_validators,
+    paginate_feed,
+    set_validators
+)
+from .models import Category, Post, User
+from .profiling import record_queries
+from .views import get_post_validators
+
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def _closing(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            with record_queries():
+                return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+def run_query(func, *args, **kwargs):
+    """Выполняет запрос в отдельном потоке со своим соединением с БД."""
+    return sync_to_async(
+        _closing(func), thread_sensitive=False
+    )(*args, **kwargs)
+
+
+def _load_user(request):
+    return request.user.is_authenticated
+
+
+def get_feed_page(request, queryset, count_scope=None):
+    """Страница ленты: пагинация и число комментариев как у ListView."""
+    return run_query(paginate_feed, request, queryset, count_scope)
+
+
+def get_feed_context(paginator, page):
+    return {
+        'paginator': paginator,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'object_list': page.object_list,
+        'post_list': page.object_list,
+    }
+
+
+async def render_feed(request, scope, get_content):
+    """Условный GET и кэш страниц для анонимных читателей, как у лент."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    await sync_to_async(_load_user)(request)
+    etag, timestamp, response = get_conditional_response_for(
+        request, *get_feed_validators(scope)
+    )
+    if response is not None:
+        return set_validators(response, etag, timestamp)
+    key = None
+    if feed_page_cache.is_cacheable(request):
+        key = feed_page_cache.get_key(request, scope)
+        response = feed_page_cache.get(key)
+        if response is not None:
+            return set_validators(response, etag, timestamp)
+    template_name, context = await get_content()
+    response = await sync_to_async(render)(request, template_name, context)
+    if key is not None:
+        # Срок жизни страницы зависит от ближайшей отложенной публикации,
+        # которую планировщик может запросить из БД.
+        await run_query(feed_page_cache.set, key, response)
+    return set_validators(response, etag, timestamp)
+
+
+async def index(request):
+    async def get_content():
+        paginator, page = await get_feed_page(
+            request,
+            filter_objects_published(
+                get_feed_objects(Post.objects)
+            ).order_by('-pub_date'),
+            'index'
+        )
+        return 'blog/index.html', get_feed_context(paginator, page)
+
+    return await render_feed(request, 'index', get_content)
+
+
+async def category_posts(request, category_slug):
+    async def get_content():
+        category, (paginator, page) = await gather(
+            run_query(
+                Category.objects.filter(
+                    is_published=True, slug=category_slug
+                ).first
+            ),
+            get_feed_page(
+                request,
+                filter_objects_published(
+                    get_feed_objects(
+                        Post.objects.filter(category__slug=category_slug)
+                    )
+                ).order_by('-pub_date'),
+                f'category:{category_slug}'
+            )
+        )
+        if category is None:
+            raise Http404('Категория не найдена.')
+        context = get_feed_context(paginator, page)
+        context['category'] = category
+        return 'blog/category.html', context
+
+    return await render_feed(
+        request, f'category:{category_slug}', get_content
+    )
+
+
+async def profile(request, username):
+    async def get_content():
+        posts = get_feed_objects(
+            Post.objects.filter(author__username=username)
+        ).order_by('-pub_date')
+        if request.user.username != username:
+            posts = filter_objects_published(posts)
+        user, (paginator, page) = await gather(
+            run_query(
+                User.objects.select_related('author_stats').filter(
+                    username=username
+                ).first
+            ),
+            get_feed_page(request, posts, f'author:{username}')
+        )
+        if user is None:
+            raise Http404('Пользователь не найден.')
+        context = get_feed_context(paginator, page)
+        context['profile'] = user
+        return 'blog/profile.html', context
+
+    return await render_feed(request, f'author:{username}', get_content)
+
+
+async def post_detail(request, post_id):
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    await sync_to_async(_load_user)(request)
+    post, comments_page = await gather(
+        run_query(
+            get_objects_related(
+                filter_post_visible(Post.objects, request.user)
+            ).filter(pk=post_id).first
+        ),
+        run_query(get_comments_page, Post(pk=post_id))
+    )
+    if post is None:
+        raise Http404('Публикация не найдена.')
+    etag, timestamp, response = get_conditional_response_for(
+        request, *get_post_validators(post)
+    )
+    if response is None:
+        response = await sync_to_async(render)(request, 'blog/detail.html', {
+            'object': post,
+            'post': post,
+            'form': CommentForm(),
+            'comments_page': comments_page,
+            'comments': comments_page.object_list,
+        })
+    return set_validators(response, etag, timestamp)
@@ -0,0 +1,161 @@
+from hashlib import md5
+from threading import Lock
+from time import time_ns
+
+from django.core.cache import caches
+from django.utils.timezone import now
+
+from .constants import (
+    FEED_PAGE_CACHE_ALIAS,
+    FEED_PAGE_CACHE_TIMEOUT,
+    POST_CARD_CACHE_ALIAS,
+    POST_CARD_CACHE_TIMEOUT
+)
+from .scheduler import publication_scheduler
+
+
+class PostCardCache:
+    """Кэш отрисованных карточек публикаций.
+
+    Ключ карточки содержит версии публикации, автора, категории и
+    местоположения; сигналы сдвигают версию, и старая карточка
+    просто перестаёт находиться.
+    """
+
+    key_prefix = 'post_card'
+    version_kinds = ('post', 'author', 'category', 'location')
+
+    def __init__(self, alias=POST_CARD_CACHE_ALIAS,
+                 timeout=POST_CARD_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self, kind, pk):
+        return f'{self.key_prefix}:v:{kind}:{pk}'
+
+    def bump(self, kind, pk):
+        """Делает недействительными все карточки, зависящие от объекта."""
+        self.cache.set(self._version_key(kind, pk), time_ns(), None)
+
+    def get_stamp(self, post):
+        keys = [
+            self._version_key(kind, pk) for kind, pk in zip(
+                self.version_kinds,
+                (post.pk, post.author_id, post.category_id, post.location_id)
+            )
+        ]
+        versions = self.cache.get_many(keys)
+        missing = {key: time_ns() for key in keys if key not in versions}
+        if missing:
+            # Потерянная версия получает новое значение, поэтому
+            # вытесненный счётчик не может вернуть устаревшую карточку.
+            self.cache.set_many(missing, None)
+            versions.update(missing)
+        return '.'.join(str(versions[key]) for key in keys)
+
+    def get_or_render(self, post, render):
+        key = f'{self.key_prefix}:{post.pk}:{self.get_stamp(post)}'
+        html = self.cache.get(key)
+        with self._lock:
+            if html is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if html is None:
+            html = render()
+            self.cache.set(key, html, self.timeout)
+        return html
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+post_card_cache = PostCardCache()
+
+
+class FeedPageCache:
+    """Кэш готовых страниц лент для анонимных читателей.
+
+    Ключ страницы содержит общую версию лент и версию области
+    (главная, категория, автор). Записи живут до ближайшей отложенной
+    публикации, а раньше сбрасываются сигналами.
+    """
+
+    key_prefix = 'feed_page'
+    global_scope = 'all'
+
+    def __init__(self, alias=FEED_PAGE_CACHE_ALIAS,
+                 timeout=FEED_PAGE_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self, scope):
+        return f'{self.key_prefix}:v:{scope}'
+
+    def bump(self, *scopes):
+        self.cache.set_many(
+            {self._version_key(scope): time_ns() for scope in scopes},
+            None
+        )
+
+    def bump_all(self):
+        self.bump(self.global_scope)
+
+    def is_cacheable(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+        )
+
+    def get_versions(self, scope):
+        """Версии лент в наносекундах: общая и области scope."""
+        keys = [
+            self._version_key(self.global_scope),
+            self._version_key(scope)
+        ]
+        versions = self.cache.get_many(keys)
+        missing = {key: time_ns() for key in keys if key not in versions}
+        if missing:
+            self.cache.set_many(missing, None)
+            versions.update(missing)
+        return [versions[key] for key in keys]
+
+    def get_key(self, request, scope):
+        path = md5(request.get_full_path().encode()).hexdigest()
+        stamp = '.'.join(map(str, self.get_versions(scope)))
+        return f'{self.key_prefix}:{scope}:{stamp}:{path}'
+
+    def get_timeout(self):
+        # Планировщик сбрасывает ленты в момент публикации; срок жизни
+        # страниц — страховка, если событие до процесса не дошло.
+        next_publication_at = publication_scheduler.get_next_at()
+        if next_publication_at is None:
+            return self.timeout
+        seconds = (next_publication_at - now()).total_seconds()
+        return max(1, min(self.timeout, int(seconds)))
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, response):
+        self.cache.set(key, response, self.get_timeout())
+
+
+feed_page_cache = FeedPageCache()
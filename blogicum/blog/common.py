@@ -1,5 +1,15 @@
-from django.db.models import Count
-from django.utils.timezone import now
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, F, Min, Q
+from django.utils.timezone import localtime, make_aware, now
+
+from .constants import (
+    COMMENT_COUNT_JOIN,
+    COMMENTS_PAGE_LIMIT,
+    POST_CARD_FIELDS
+)
+from .models import Comment, Post
+from .paginators import CursorPaginator
 
 
 def get_objects_related(objs):
@@ -13,15 +23,99 @@ def get_objects_related(objs):
     )
 
 
+def get_feed_objects(objs):
+    """Выборка для карточек ленты: только поля, которые они показывают.
+
+    Полный текст и лишние столбцы автора и категории не загружаются;
+    вместо текста карточка показывает хранимый анонс.
+    """
+    return get_objects_related(objs).only(*POST_CARD_FIELDS)
+
+
+def get_publication_boundary():
+    """Начало завтрашнего дня в текущем часовом поясе.
+
+    pub_date__lt от этой границы равносилен pub_date__date__lte=now(),
+    но не оборачивает столбец в DATE() и позволяет использовать индекс.
+    """
+    tomorrow = localtime(now()).date() + timedelta(days=1)
+    return make_aware(datetime.combine(tomorrow, time.min))
+
+
+def get_next_publication_at():
+    """Момент, когда в лентах появится ближайшая отложенная публикация."""
+    next_pub_date = Post.objects.filter(
+        is_published=True,
+        pub_date__gte=get_publication_boundary()
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return None
+    return make_aware(
+        datetime.combine(localtime(next_pub_date).date(), time.min)
+    )
+
+
 def filter_objects_published(objs):
     return objs.filter(
         is_published=True,
         category__is_published=True,
-        pub_date__date__lte=now()
+        pub_date__lt=get_publication_boundary()
+    )
+
+
+def filter_post_visible(objs, user):
+    """Публикации, которые пользователь может открыть."""
+    filters = (
+        Q(pub_date__lt=get_publication_boundary())
+        & Q(is_published=True)
+        & Q(category__is_published=True)
+    )
+    if not user.is_anonymous:
+        filters |= Q(author=user)
+    return objs.filter(filters)
+
+
+def get_comments_page(post, cursor=None):
+    """Порция комментариев публикации по курсору (created_at, id)."""
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PAGE_LIMIT,
+        key_field='created_at',
+        descending=False
+    ).page(cursor)
+
+
+def change_comment_count(post_id, delta):
+    """Атомарно изменяет хранимый счётчик комментариев публикации."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta
     )
 
 
 def add_annotations_comments(objs):
-    return objs.annotate(
-        comment_count=Count('comments')
+    """Число комментариев в том же запросе: JOIN и GROUP BY."""
+    return objs.annotate(comments_total=Count('comments'))
+
+
+def get_comment_counts(post_ids):
+    """Число комментариев публикаций одним запросом post_id IN (...)."""
+    return dict(
+        Comment.objects.filter(post_id__in=list(post_ids)).order_by().values(
+            'post'
+        ).annotate(total=Count('pk')).values_list('post', 'total')
     )
+
+
+def set_comment_counts(posts, strategy):
+    """Подставляет в публикации страницы посчитанное число комментариев.
+
+    При COMMENT_COUNT_JOIN число уже пришло аннотацией, иначе
+    считается отдельным запросом только для публикаций страницы.
+    """
+    if strategy == COMMENT_COUNT_JOIN:
+        totals = {post.pk: post.comments_total for post in posts}
+    else:
+        totals = get_comment_counts(post.pk for post in posts)
+    for post in posts:
+        post.comment_count = totals.get(post.pk, 0)
+    return posts
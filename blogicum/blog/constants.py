@@ -1,3 +1,53 @@
 MAX_LENGTH_TITLE: int = 256
 MAX_LENGTH_RENDER_TITLE: int = 20
 POSTS_PAGE_LIMIT: int = 10
+COMMENTS_PAGE_LIMIT: int = 50
+PAGINATION_MODE_OFFSET: str = 'offset'
+PAGINATION_MODE_CURSOR: str = 'cursor'
+PAGINATION_MODE: str = PAGINATION_MODE_OFFSET
+COMMENT_COUNT_STORED: str = 'stored'
+COMMENT_COUNT_JOIN: str = 'join'
+COMMENT_COUNT_IN_QUERY: str = 'in_query'
+COMMENT_COUNT_STRATEGY: str = COMMENT_COUNT_STORED
+POST_CARD_CACHE_ALIAS: str = 'post_cards'
+POST_CARD_CACHE_TIMEOUT: int = 60 * 60 * 24
+FEED_PAGE_CACHE_ALIAS: str = 'feed_pages'
+FEED_PAGE_CACHE_TIMEOUT: int = 60 * 60
+SEARCH_RESULTS_LIMIT: int = 1000
+IMAGE_VARIANTS: dict = {'feed': 640, 'detail': 1280}
+IMAGE_WEBP_QUALITY: int = 80
+IMAGE_UPLOAD_FIELDS: tuple = ('image',)
+IMAGE_UPLOAD_FORMATS: tuple = ('JPEG', 'PNG', 'GIF', 'WEBP')
+IMAGE_UPLOAD_MAX_SIZE: int = 10 * 1024 * 1024
+IMAGE_UPLOAD_MAX_PIXELS: int = 24_000_000
+IMAGE_HEADER_MAX_BYTES: int = 256 * 1024
+IMAGE_MAX_DIMENSION: int = 2560
+TASK_MAX_ATTEMPTS: int = 3
+TASK_RETRY_DELAY: float = 2
+TASK_POLL_INTERVAL: float = 0.5
+TASK_VISIBILITY_TIMEOUT: int = 5 * 60
+PUBLICATION_SCHEDULER_CACHE_ALIAS: str = 'default'
+PUBLICATION_SCHEDULER_INTERVAL: int = 60
+PRIMARY_STICKY_SECONDS: int = 5
+PROFILING_BUFFER_SIZE: int = 1000
+PROFILING_LOG_MAX_BYTES: int = 5 * 1024 * 1024
+PROFILING_LOG_BACKUPS: int = 3
+PROFILING_SIMILAR_THRESHOLD: int = 5
+TEMPLATE_PRECOMPILE_SUFFIXES: tuple = ('.html', '.txt', '.xml')
+PAGINATION_WINDOW: int = 2
+PAGINATION_ESTIMATE_COUNT: bool = False
+COUNT_ESTIMATE_SAMPLE: int = 1000
+COUNT_ESTIMATE_THRESHOLD: int = 10_000
+FEED_COUNT_CACHE_ALIAS: str = 'default'
+FEED_COUNT_CACHE_TIMEOUT: int = 10 * 60
+FEED_COUNT_FIELDS: tuple = (
+    'is_published', 'pub_date', 'category_id', 'author_id'
+)
+POST_EXCERPT_WORDS: int = 10
+POST_EXCERPT_MAX_LENGTH: int = 512
+POST_CARD_FIELDS: tuple = (
+    'title', 'excerpt', 'pub_date', 'is_published', 'image', 'comment_count',
+    'author', 'author__username',
+    'category', 'category__title', 'category__slug', 'category__is_published',
+    'location', 'location__name', 'location__is_published',
+)
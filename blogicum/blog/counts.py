@@ -0,0 +1,212 @@
+from hashlib import md5
+from time import time_ns
+
+from django.core.cache import caches
+from django.utils.functional import cached_property
+
+from .constants import (
+    COUNT_ESTIMATE_THRESHOLD,
+    FEED_COUNT_CACHE_ALIAS,
+    FEED_COUNT_CACHE_TIMEOUT,
+)
+from .models import Category, User
+from .paginators import WindowedPaginator, estimate_count
+
+
+def get_count_scopes(category_ids, author_ids):
+    """Области счётчиков лент, в которые могут попасть публикации.
+
+    Области названы по slug категории и имени автора, как и области
+    кэша страниц: так асинхронные ленты считают публикации, не дожидаясь
+    загрузки категории или автора.
+    """
+    slugs = Category.objects.filter(pk__in=category_ids).values_list(
+        'slug', flat=True
+    )
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        'username', flat=True
+    )
+    return {
+        'index',
+        *(f'category:{slug}' for slug in slugs),
+        *(f'author:{username}' for username in usernames),
+    }
+
+
+class FeedCountCache:
+    """Кэш числа публикаций в лентах.
+
+    Ключ счётчика — подпись запроса (SQL с параметрами), поэтому
+    ленты с разными фильтрами считаются отдельно. Каждая область
+    (главная, категория, автор) ведёт реестр своих подписей вместе
+    с запросами. При изменении полей FEED_COUNT_FIELDS сигналы проверяют,
+    входила ли публикация в выборку до и после, и сдвигают счётчик на
+    разницу вместо повторного COUNT(*).
+
+    Реестр не перезаписывается целиком: каждая регистрация занимает
+    свой слот, номер которого выдаёт атомарный incr, поэтому
+    параллельные запросы не теряют чужие подписи.
+    """
+
+    key_prefix = 'feed_count'
+
+    def __init__(self, alias=FEED_COUNT_CACHE_ALIAS,
+                 timeout=FEED_COUNT_CACHE_TIMEOUT):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version(self):
+        key = f'{self.key_prefix}:v'
+        version = self.cache.get(key)
+        if version is None:
+            version = time_ns()
+            self.cache.set(key, version, None)
+        return version
+
+    def _registry_key(self, scope, name):
+        return f'{self.key_prefix}:scope:{scope}:{name}'
+
+    def get_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        signature = md5(f'{sql}|{params!r}'.encode()).hexdigest()
+        return f'{self.key_prefix}:{self._version()}:{signature}'
+
+    def bump(self):
+        """Сбрасывает все счётчики, например после смены категории."""
+        self.cache.set(f'{self.key_prefix}:v', time_ns(), None)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, count, queryset, scope):
+        self.cache.set(key, count, self.timeout)
+        self.register(key, queryset, scope)
+
+    def correct(self, key, count):
+        """Заменяет оценку числом, уточнённым по строкам страницы."""
+        self.cache.set(key, count, self.timeout)
+
+    def register(self, key, queryset, scope):
+        """Добавляет подпись в реестр области, если её там ещё нет."""
+        if not self.cache.add(
+            self._registry_key(scope, f'query:{key}'),
+            queryset.query,
+            self.timeout
+        ):
+            return
+        slots_key = self._registry_key(scope, 'slots')
+        self.cache.add(slots_key, 0, None)
+        slot = self.cache.incr(slots_key)
+        self.cache.set(
+            self._registry_key(scope, f'slot:{slot}'), key, self.timeout
+        )
+
+    def get_registry(self, scope):
+        """Живые подписи области: ключ счётчика и его запрос."""
+        last = self.cache.get(self._registry_key(scope, 'slots'))
+        if not last:
+            return {}
+        first_key = self._registry_key(scope, 'first')
+        first = self.cache.get(first_key) or 1
+        if first > last:
+            # Номер слотов вытеснен из кэша и начат заново.
+            first = 1
+        slot_keys = [
+            self._registry_key(scope, f'slot:{slot}')
+            for slot in range(first, last + 1)
+        ]
+        slots = self.cache.get_many(slot_keys)
+        alive = [slot_key for slot_key in slot_keys if slot_key in slots]
+        # Слоты ниже первого живого истекли, и их номера не повторяются.
+        skipped = slot_keys.index(alive[0]) if alive else len(slot_keys)
+        if skipped:
+            self.cache.set(first_key, first + skipped, None)
+        keys = [slots[slot_key] for slot_key in alive]
+        counts = self.cache.get_many(keys)
+        query_keys = {
+            key: self._registry_key(scope, f'query:{key}') for key in counts
+        }
+        queries = self.cache.get_many(list(query_keys.values()))
+        return {
+            key: queries[query_key]
+            for key, query_key in query_keys.items()
+            if query_key in queries
+        }
+
+    def get_queries(self, scopes):
+        """Подписи и запросы всех перечисленных областей."""
+        queries = {}
+        for scope in scopes:
+            queries.update(self.get_registry(scope))
+        return queries
+
+    def get_membership(self, model, pk, queries):
+        """Ключи счётчиков, в выборки которых сейчас входит объект."""
+        members = set()
+        for key, query in queries.items():
+            queryset = model._base_manager.all()
+            queryset.query = query
+            if queryset.filter(pk=pk).exists():
+                members.add(key)
+        return members
+
+    def apply(self, before, after):
+        """Сдвигает счётчики по изменению членства в выборках."""
+        for keys, delta in ((after - before, 1), (before - after, -1)):
+            for key in keys:
+                try:
+                    self.cache.incr(key, delta)
+                except ValueError:
+                    # Счётчик истёк — его пересчитают при чтении.
+                    pass
+
+
+feed_count_cache = FeedCountCache()
+
+
+class CachedCountPaginator(WindowedPaginator):
+    """Пагинатор ленты, который берёт число публикаций из кэша.
+
+    Без кэша число считается COUNT(*), а если оценка по статистике
+    больше COUNT_ESTIMATE_THRESHOLD — берётся оценка.
+    """
+
+    def __init__(self, *args, count_scope=None,
+                 count_threshold=COUNT_ESTIMATE_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_scope = count_scope
+        self.count_threshold = count_threshold
+        self.count_key = None
+
+    def _count(self):
+        estimate = estimate_count(self.object_list, self.estimate_sample)
+        if estimate is not None and estimate > self.count_threshold:
+            self.estimated = True
+            return estimate
+        return self.object_list.count()
+
+    @cached_property
+    def count(self):
+        if self.count_scope is None or self.estimate_count:
+            return super().count
+        self.count_key = feed_count_cache.get_key(self.object_list)
+        count = feed_count_cache.get(self.count_key)
+        if count is None:
+            count = self._count()
+            feed_count_cache.set(
+                self.count_key, count, self.object_list, self.count_scope
+            )
+        elif count > self.count_threshold:
+            self.estimated = True
+        return count
+
+    def page(self, number):
+        count = self.count
+        page = super().page(number)
+        if self.count_key is not None and self.count != count:
+            feed_count_cache.correct(self.count_key, self.count)
+        return page
@@ -1,9 +1,37 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
+from django.core.files.uploadedfile import UploadedFile
+from django.template.loader import render_to_string
 
+from .images import reencode_upload
 from .models import Comment, Post
+from .tasks import send_email
 
 
-class PostForm(forms.ModelForm):
+class PostImageMixin:
+    """Ошибки приёма изображения и его перекодирование.
+
+    Поле image необязательное: без ошибки из ``upload_errors``
+    отклонённый ImageUploadHandler файл молча пропал бы из формы.
+    """
+
+    upload_errors = {}
+
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if upload_errors is not None:
+            self.upload_errors = upload_errors
+
+    def clean_image(self):
+        if 'image' in self.upload_errors:
+            raise forms.ValidationError(self.upload_errors['image'])
+        image = self.cleaned_data['image']
+        if isinstance(image, UploadedFile):
+            return reencode_upload(image)
+        return image
+
+
+class PostForm(PostImageMixin, forms.ModelForm):
     """Форма публикации."""
 
     class Meta:
@@ -20,9 +48,33 @@ class PostForm(forms.ModelForm):
         }
 
 
+class PostAdminForm(PostImageMixin, forms.ModelForm):
+    """Форма публикации в админке."""
+
+    class Meta:
+        model = Post
+        fields = '__all__'
+
+
 class CommentForm(forms.ModelForm):
     """Форма комментария."""
 
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Сброс пароля с отправкой письма из очереди задач."""
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = ''.join(
+            render_to_string(subject_template_name, context).splitlines()
+        )
+        body = render_to_string(email_template_name, context)
+        html = None
+        if html_email_template_name is not None:
+            html = render_to_string(html_email_template_name, context)
+        send_email.delay(subject, body, from_email, [to_email], html)
@@ -0,0 +1,172 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from PIL import Image, ImageOps, ImageSequence
+
+from .constants import (
+    IMAGE_MAX_DIMENSION, IMAGE_UPLOAD_MAX_PIXELS, IMAGE_VARIANTS,
+    IMAGE_WEBP_QUALITY
+)
+
+
+def get_derivative_names(name):
+    """Имена производных файлов: вариант -> (основной формат, WebP).
+
+    Расширение оригинала входит в имя, чтобы photo.jpg и photo.png
+    из одного каталога не делили производные.
+    """
+    path = PurePosixPath(name)
+    suffix = path.suffix.lower()
+    lossless = suffix in ('.png', '.gif')
+    fallback_ext = '.png' if lossless else '.jpg'
+    directory = path.parent / 'derivatives'
+    base = f'{path.stem}_{suffix.lstrip(".")}' if suffix else path.stem
+    return {
+        variant: (
+            str(directory / f'{base}_{variant}{fallback_ext}'),
+            str(directory / f'{base}_{variant}.webp'),
+        )
+        for variant in IMAGE_VARIANTS
+    }
+
+
+def derivatives_exist(name):
+    return all(
+        default_storage.exists(fallback)
+        for fallback, _ in get_derivative_names(name).values()
+    )
+
+
+ENCODE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': IMAGE_WEBP_QUALITY},
+}
+
+
+def resize_frames(image, bounds):
+    """Кадры изображения, уменьшенные до bounds; у статичного — один."""
+    frames = []
+    for frame in ImageSequence.Iterator(image):
+        frame = frame.copy()
+        frame.thumbnail(bounds)
+        frames.append(frame)
+    return frames
+
+
+def save_frames(frames, output, image_format, **options):
+    """Сохраняет кадры; больше одного кадра пишется как анимация."""
+    if len(frames) > 1:
+        if image_format == 'PNG':
+            # Pillow не записывает APNG из кадров с палитрой.
+            frames = [frame.convert('RGBA') for frame in frames]
+        options.update(
+            save_all=True,
+            append_images=frames[1:],
+            duration=[frame.info.get('duration', 100) for frame in frames],
+            loop=frames[0].info.get('loop', 0),
+        )
+    frames[0].save(output, image_format, **options)
+
+
+def reencode_upload(upload):
+    """Перекодирует загруженное изображение, ограничивая его размеры.
+
+    JPEG декодируется сразу в уменьшенном масштабе, у анимации
+    уменьшается каждый кадр. Результат пишется во временный файл,
+    который держится в памяти только до FILE_UPLOAD_MAX_MEMORY_SIZE.
+    """
+    upload.seek(0)
+    image = Image.open(upload)
+    image_format = image.format
+    bounds = (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION)
+    if getattr(image, 'is_animated', False):
+        width, height = image.size
+        if width * height * image.n_frames > IMAGE_UPLOAD_MAX_PIXELS:
+            raise ValidationError(
+                f'Анимация слишком большая: {image.n_frames} кадров '
+                f'{width}×{height}.'
+            )
+        frames = resize_frames(image, bounds)
+    else:
+        if image_format == 'JPEG':
+            image.draft('RGB', bounds)
+        image.thumbnail(bounds)
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        frames = [image]
+    output = SpooledTemporaryFile(
+        max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+    )
+    save_frames(
+        frames, output, image_format, **ENCODE_OPTIONS.get(image_format, {})
+    )
+    size = output.tell()
+    output.seek(0)
+    return UploadedFile(
+        output, name=upload.name, content_type=upload.content_type, size=size
+    )
+
+
+def _encode(frames, image_format, **options):
+    buffer = BytesIO()
+    save_frames(frames, buffer, image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def _replace(name, content):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    default_storage.save(name, content)
+
+
+def generate_derivatives(name):
+    """Создаёт уменьшенные копии изображения для ленты и страницы поста.
+
+    Анимация сохраняется в PNG и WebP; JPEG получает первый кадр.
+    """
+    with default_storage.open(name, 'rb') as source:
+        original = Image.open(source)
+        for variant, (fallback, webp) in get_derivative_names(name).items():
+            width = IMAGE_VARIANTS[variant]
+            frames = resize_frames(original, (width, width * 4))
+            if fallback.endswith('.png'):
+                _replace(fallback, _encode(frames, 'PNG', optimize=True))
+            else:
+                _replace(fallback, _encode(
+                    [frames[0].convert('RGB')], 'JPEG', quality=85,
+                    optimize=True, progressive=True
+                ))
+            _replace(webp, _encode(
+                frames, 'WEBP', quality=IMAGE_WEBP_QUALITY
+            ))
+
+
+def get_responsive_sources(image, variant):
+    """Адреса и srcset для тега picture; None, если копий ещё нет."""
+    names = get_derivative_names(image.name)
+    if not derivatives_exist(image.name):
+        return None
+    widths = sorted(
+        (IMAGE_VARIANTS[name], name) for name in IMAGE_VARIANTS
+    )
+    return {
+        'src': default_storage.url(names[variant][0]),
+        'srcset': ', '.join(
+            f'{default_storage.url(names[name][0])} {width}w'
+            for width, name in widths
+        ),
+        'webp_srcset': ', '.join(
+            f'{default_storage.url(names[name][1])} {width}w'
+            for width, name in widths
+        ),
+        'sizes': f'(max-width: {IMAGE_VARIANTS[variant]}px) 100vw, '
+                 f'{IMAGE_VARIANTS[variant]}px',
+    }
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.template_cache import precompile_templates
+
+
+class Command(BaseCommand):
+    help = 'Разбирает все шаблоны, чтобы найти ошибки до выкладки.'
+
+    def handle(self, *args, **options):
+        total, errors = precompile_templates()
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Ошибок в шаблонах: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(f'Разобрано шаблонов: {total}'))
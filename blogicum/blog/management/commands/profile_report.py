@@ -0,0 +1,95 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.constants import PROFILING_LOG_BACKUPS, PROFILING_SIMILAR_THRESHOLD
+
+
+def read_profiles(path):
+    """Замеры из журнала и его ротированных копий."""
+    paths = [Path(f'{path}.{number}') for number in range(
+        PROFILING_LOG_BACKUPS, 0, -1
+    )] + [Path(path)]
+    for log in paths:
+        if not log.exists():
+            continue
+        with log.open(encoding='utf-8') as lines:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def summarize(profiles):
+    """Сводка по представлениям: средние значения и худший N+1."""
+    views = defaultdict(list)
+    for profile in profiles:
+        views[profile['view']].append(profile)
+    summary = []
+    for view, items in views.items():
+        total = len(items)
+        worst = max(items, key=lambda item: item['similar'])
+        summary.append({
+            'view': view,
+            'requests': total,
+            'duration': sum(item['duration'] for item in items) / total,
+            'max_duration': max(item['duration'] for item in items),
+            'queries': sum(item['queries'] for item in items) / total,
+            'sql_time': sum(item['sql_time'] for item in items) / total,
+            'render': sum(item['render'] for item in items) / total,
+            'size': sum(item['size'] or 0 for item in items) / total,
+            'duplicates': max(item['duplicates'] for item in items),
+            'similar': worst['similar'],
+            'similar_sql': worst['similar_sql'],
+        })
+    return summary
+
+
+class Command(BaseCommand):
+    help = 'Показывает самые медленные представления и повторы запросов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log', default=settings.PROFILING_LOG,
+            help='Журнал ProfilingMiddleware.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=10,
+            help='Сколько представлений показать.'
+        )
+
+    def handle(self, *args, **options):
+        summary = summarize(read_profiles(options['log']))
+        if not summary:
+            self.stdout.write('Замеров нет.')
+            return
+        limit = options['limit']
+        self.stdout.write('Самые медленные представления:')
+        for row in sorted(
+            summary, key=lambda row: row['duration'], reverse=True
+        )[:limit]:
+            self.stdout.write(
+                f"{row['view']}: запросов {row['requests']}, "
+                f"среднее {row['duration'] * 1000:.1f} мс "
+                f"(макс. {row['max_duration'] * 1000:.1f} мс), "
+                f"SQL {row['queries']:.1f} шт. / "
+                f"{row['sql_time'] * 1000:.1f} мс, "
+                f"шаблон {row['render'] * 1000:.1f} мс, "
+                f"ответ {row['size'] / 1024:.1f} КБ"
+            )
+        offenders = sorted(
+            (row for row in summary
+             if row['similar'] >= PROFILING_SIMILAR_THRESHOLD),
+            key=lambda row: row['similar'], reverse=True
+        )[:limit]
+        self.stdout.write('Повторяющиеся запросы (N+1):')
+        if not offenders:
+            self.stdout.write('не найдены')
+        for row in offenders:
+            self.stdout.write(
+                f"{row['view']}: {row['similar']} похожих, "
+                f"{row['duplicates']} точных повторов\n"
+                f"  {row['similar_sql']}"
+            )
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from blog.constants import PUBLICATION_SCHEDULER_INTERVAL
+from blog.scheduler import publication_scheduler
+
+
+class Command(BaseCommand):
+    help = 'Оповещает о появившихся в лентах отложенных публикациях.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, просыпаясь к ближайшей публикации.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            post_ids = publication_scheduler.run_due()
+            next_at = publication_scheduler.get_next_at()
+            self.stdout.write(
+                f'Опубликовано: {len(post_ids)}; '
+                f'следующая публикация: {next_at or "нет"}'
+            )
+            if not options['loop']:
+                return
+            delay = PUBLICATION_SCHEDULER_INTERVAL
+            if next_at is not None:
+                delay = min(delay, (next_at - now()).total_seconds())
+            time.sleep(max(1, delay))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.stats import rebuild_author_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику авторов по всей истории.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_author_stats()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано авторов: {total}')
+        )
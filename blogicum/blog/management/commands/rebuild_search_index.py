@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {total}')
+        )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Сверяет хранимые счётчики комментариев с фактическими.'
+
+    def handle(self, *args, **options):
+        actual_count = Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    post=OuterRef('pk')
+                ).order_by().values('post').annotate(
+                    total=Count('pk')
+                ).values('total')
+            ),
+            0
+        )
+        with transaction.atomic():
+            drifted = Post.objects.annotate(
+                actual_count=actual_count
+            ).exclude(
+                comment_count=F('actual_count')
+            ).values_list('pk', flat=True)
+            fixed = Post.objects.filter(pk__in=list(drifted)).update(
+                comment_count=actual_count
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено публикаций: {fixed}')
+        )
@@ -0,0 +1,40 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from blog.queue import task_queue
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Завершиться, когда очередь опустеет.'
+        )
+        parser.add_argument(
+            '--threads', type=int, default=1,
+            help='Число потоков-обработчиков.'
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        threads = [
+            threading.Thread(
+                target=task_queue.work,
+                kwargs={'burst': options['burst'], 'stop': stop}
+            )
+            for _ in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        for metric, value in sorted(task_queue.stats().items()):
+            self.stdout.write(f'{metric}: {value}')
@@ -0,0 +1,38 @@
+from time import time
+
+from .constants import PRIMARY_STICKY_SECONDS
+from .routers import choose_replica, read_database, uses_replica
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет читающие представления на реплику.
+
+    После успешного изменяющего запроса сессия на PRIMARY_STICKY_SECONDS
+    читает только с основной БД, чтобы пользователь сразу видел свои
+    записи, даже если реплика отстаёт.
+    """
+
+    session_key = '_primary_until'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = read_database.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_database.reset(token)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and (
+            response.status_code < 400
+        ):
+            request.session[self.session_key] = time() + PRIMARY_STICKY_SECONDS
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and uses_replica(view_func)
+            and request.session.get(self.session_key, 0) < time()
+        ):
+            read_database.set(choose_replica())
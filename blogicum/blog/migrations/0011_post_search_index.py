@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из blog.search: миграция должна
+# делать то же самое, что и в момент создания, и работать
+# с соединением schema_editor, а не с базой по умолчанию.
+DOCUMENTS = (
+    'FROM blog_post p '
+    'LEFT JOIN blog_category c ON c.id = p.category_id '
+    'LEFT JOIN blog_location l ON l.id = p.location_id'
+)
+
+SQL = {
+    'sqlite': {
+        'create': [
+            'CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5('
+            'title, text, category, location, '
+            "tokenize = 'unicode61 remove_diacritics 2')",
+            'INSERT INTO blog_post_fts '
+            '(rowid, title, text, category, location) '
+            "SELECT p.id, p.title, p.text, COALESCE(c.title, ''), "
+            f"COALESCE(l.name, '') {DOCUMENTS}",
+        ],
+        'drop': ['DROP TABLE IF EXISTS blog_post_fts'],
+    },
+    'postgresql': {
+        'create': [
+            'CREATE TABLE IF NOT EXISTS blog_post_search ('
+            'post_id bigint PRIMARY KEY '
+            'REFERENCES blog_post (id) ON DELETE CASCADE, '
+            'document tsvector NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS blog_post_search_document_idx '
+            'ON blog_post_search USING GIN (document)',
+            'INSERT INTO blog_post_search (post_id, document) '
+            "SELECT p.id, "
+            "setweight(to_tsvector('russian', p.title), 'A') || "
+            "setweight(to_tsvector('russian', p.text), 'D') || "
+            "setweight(to_tsvector('russian', COALESCE(c.title, '')), 'B') || "
+            "setweight(to_tsvector('russian', COALESCE(l.name, '')), 'B') "
+            f'{DOCUMENTS} '
+            'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+        ],
+        'drop': ['DROP TABLE IF EXISTS blog_post_search'],
+    },
+}
+
+
+def run_sql(schema_editor, action):
+    statements = SQL.get(schema_editor.connection.vendor, {}).get(action, [])
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run_sql(schema_editor, 'create')
+
+
+def drop_search_index(apps, schema_editor):
+    run_sql(schema_editor, 'drop')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
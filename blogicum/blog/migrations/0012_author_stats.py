@@ -0,0 +1,65 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:28
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values('author').annotate(
+                total=Count('pk')
+            ).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    posts = Post.objects.filter(author=OuterRef('pk'))
+    users = User.objects.annotate(
+        stats_posts=_count(posts),
+        stats_published=_count(posts.filter(is_published=True)),
+        stats_comments=_count(Comment.objects.filter(author=OuterRef('pk')))
+    ).values_list('pk', 'stats_posts', 'stats_published', 'stats_comments')
+    AuthorStats.objects.bulk_create(
+        AuthorStats(
+            user_id=pk,
+            posts_count=posts_count,
+            published_posts_count=published,
+            comments_count=comments
+        )
+        for pk, posts_count, published, comments in users.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='author_stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('published_posts_count', models.PositiveIntegerField(default=0, verbose_name='Опубликованных публикаций')),
+                ('comments_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:40
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator():
+        post.excerpt = Truncator(
+            Truncator(post.text).words(10, truncate=' …')
+        ).chars(512)
+        posts.append(post)
+    Post.objects.bulk_update(posts, ['excerpt'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_author_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=512, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='authorstats',
+            old_name='published_posts_count',
+            new_name='is_published_posts_count',
+        ),
+        migrations.AlterField(
+            model_name='authorstats',
+            name='is_published_posts_count',
+            field=models.PositiveIntegerField(default=0, help_text='Включая отложенные и публикации в снятых категориях.', verbose_name='Публикаций с отметкой «Опубликовано»'),
+        ),
+    ]
@@ -1,10 +1,43 @@
 from audioop import reverse
+from datetime import datetime, timedelta
+from hashlib import md5
 
 from django.contrib.auth.mixins import UserPassesTestMixin, LoginRequiredMixin
 from django.shortcuts import redirect, get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.utils.timezone import utc
+from django.views.generic.list import MultipleObjectMixin
 
+from blog.cache import feed_page_cache
+from blog.common import (
+    add_annotations_comments,
+    get_objects_related,
+    get_publication_boundary,
+    set_comment_counts,
+)
+from blog.constants import (
+    COMMENT_COUNT_JOIN,
+    COMMENT_COUNT_STORED,
+    COMMENT_COUNT_STRATEGY,
+    PAGINATION_ESTIMATE_COUNT,
+    PAGINATION_MODE,
+    PAGINATION_MODE_CURSOR,
+    POSTS_PAGE_LIMIT,
+)
 from blog.models import Post
+from blog.counts import CachedCountPaginator
+from blog.paginators import CursorPaginator
+
+
+class UploadErrorsMixin:
+    """Передаёт в форму ошибки, найденные при приёме файлов."""
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['upload_errors'] = getattr(self.request, 'upload_errors', {})
+        return kwargs
 
 
 class AuthorMixin(UserPassesTestMixin):
@@ -28,13 +61,17 @@ class PostMixin(AuthorMixin, LoginRequiredMixin):
 
     def dispatch(self, request, *args, **kwargs):
         self.post_object = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
+            get_objects_related(Post.objects),
+            pk=self.kwargs[self.pk_url_kwarg]
         )
         if request.user != self.post_object.author:
             return redirect('blog:post_detail', kwargs[self.pk_url_kwarg])
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        """Публикация уже загружена в dispatch вместе со связанными."""
+        return self.post_object
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['post'] = self.post_object
@@ -49,3 +86,182 @@ class SuccessUrlCommentMixin(LoginRequiredMixin):
         return reverse(
             'blog:post_detail',
             kwargs={'post_id': self.kwargs['post_id']})
+
+
+class CursorPaginationMixin:
+    """Keyset-пагинация ленты вместо OFFSET и COUNT(*).
+
+    Включается атрибутом pagination_mode или параметром запроса cursor.
+    """
+
+    pagination_mode = PAGINATION_MODE
+    cursor_paginator_class = CursorPaginator
+    cursor_kwarg = 'cursor'
+
+    def uses_cursor_pagination(self):
+        return (
+            self.pagination_mode == PAGINATION_MODE_CURSOR
+            or self.cursor_kwarg in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.cursor_paginator_class(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class CommentCountMixin:
+    """Выбирает, откуда карточки ленты берут число комментариев.
+
+    COMMENT_COUNT_STORED — хранимый столбец, COMMENT_COUNT_JOIN —
+    Count('comments') в запросе ленты, COMMENT_COUNT_IN_QUERY —
+    отдельный запрос post_id IN (...) по публикациям страницы.
+    """
+
+    comment_count_strategy = COMMENT_COUNT_STRATEGY
+
+    def paginate_queryset(self, queryset, page_size):
+        strategy = self.comment_count_strategy
+        if strategy == COMMENT_COUNT_JOIN:
+            queryset = add_annotations_comments(queryset)
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size)
+        )
+        if strategy != COMMENT_COUNT_STORED:
+            page.object_list = set_comment_counts(
+                list(object_list), strategy
+            )
+        return paginator, page, page.object_list, is_paginated
+
+
+class WindowedPaginationMixin:
+    """Номерная пагинация с окном ссылок вокруг текущей страницы.
+
+    При estimate_count число страниц оценивается без COUNT(*); иначе
+    число публикаций кэшируется в области get_count_scope().
+    """
+
+    paginator_class = CachedCountPaginator
+    estimate_count = PAGINATION_ESTIMATE_COUNT
+    count_scope = None
+
+    def get_count_scope(self):
+        return self.count_scope
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            estimate_count=self.estimate_count,
+            count_scope=self.get_count_scope(), **kwargs
+        )
+
+
+class FeedPagination(
+    CommentCountMixin,
+    CursorPaginationMixin,
+    WindowedPaginationMixin,
+    MultipleObjectMixin
+):
+    """Пагинация лент вне ListView, например в асинхронных представлениях."""
+
+    def __init__(self, request, count_scope=None):
+        self.request = request
+        self.kwargs = {}
+        self.count_scope = count_scope
+
+
+def paginate_feed(request, queryset, count_scope=None,
+                  per_page=POSTS_PAGE_LIMIT):
+    """Пагинатор и страница ленты по тем же правилам, что у ListView."""
+    paginator, page, _, _ = FeedPagination(
+        request, count_scope
+    ).paginate_queryset(queryset, per_page)
+    return paginator, page
+
+
+class AnonymousPageCacheMixin:
+    """Отдаёт анонимным читателям готовую страницу ленты из кэша."""
+
+    page_cache_scope = 'index'
+
+    def get_page_cache_scope(self):
+        return self.page_cache_scope
+
+    def dispatch(self, request, *args, **kwargs):
+        if not feed_page_cache.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = feed_page_cache.get_key(request, self.get_page_cache_scope())
+        response = feed_page_cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: feed_page_cache.set(key, rendered)
+            )
+        return response
+
+
+def get_conditional_response_for(request, parts, last_modified):
+    """ETag, метка времени и ответ 304, если версия у клиента актуальна."""
+    parts = (*parts, request.user.pk)
+    etag = quote_etag(md5(repr(parts).encode()).hexdigest())
+    timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    return etag, timestamp, response
+
+
+def set_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+        patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def get_feed_validators(scope):
+    """Валидаторы ленты по версиям из кэша страниц, без запросов к БД."""
+    versions = feed_page_cache.get_versions(scope)
+    boundary = get_publication_boundary()
+    last_modified = max(
+        datetime.fromtimestamp(max(versions) / 10 ** 9, tz=utc),
+        boundary - timedelta(days=1)
+    )
+    return (*versions, boundary.isoformat()), last_modified
+
+
+class ConditionalGetMixin:
+    """Отвечает 304, если у клиента уже есть актуальная версия страницы.
+
+    Валидаторы задаёт get_validators(); без них запрос
+    обрабатывается как обычно.
+    """
+
+    def get_validators(self):
+        """Пара (части ETag, время последнего изменения) или None."""
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        validators = None
+        if request.method in ('GET', 'HEAD'):
+            validators = self.get_validators()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+        etag, timestamp, response = get_conditional_response_for(
+            request, *validators
+        )
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return set_validators(response, etag, timestamp)
+
+
+class FeedConditionalGetMixin(ConditionalGetMixin):
+    """Валидаторы ленты по версиям из кэша страниц, без запросов к БД."""
+
+    def get_validators(self):
+        return get_feed_validators(self.get_page_cache_scope())
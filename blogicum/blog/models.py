@@ -1,13 +1,26 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.text import Truncator
 
 from core.models import CreatedAt, IsPublishedCreatedAt
-from .constants import MAX_LENGTH_RENDER_TITLE, MAX_LENGTH_TITLE
+from .constants import (
+    MAX_LENGTH_RENDER_TITLE,
+    MAX_LENGTH_TITLE,
+    POST_EXCERPT_MAX_LENGTH,
+    POST_EXCERPT_WORDS
+)
 
 
 User = get_user_model()
 
 
+def make_excerpt(text):
+    """Анонс для карточки: как фильтр truncatewords, но один раз."""
+    return Truncator(
+        Truncator(text).words(POST_EXCERPT_WORDS, truncate=' …')
+    ).chars(POST_EXCERPT_MAX_LENGTH)
+
+
 class Category(IsPublishedCreatedAt):
     title = models.CharField('Заголовок', max_length=MAX_LENGTH_TITLE)
     description = models.TextField('Описание')
@@ -67,15 +80,53 @@ class Post(IsPublishedCreatedAt):
         related_name='posts',
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    excerpt = models.CharField(
+        'Анонс',
+        max_length=POST_EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('is_published', '-pub_date', 'id'),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_published_partial_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title[:MAX_LENGTH_RENDER_TITLE]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
 class Comment(CreatedAt):
 
@@ -84,8 +135,11 @@ class Comment(CreatedAt):
         User, on_delete=models.CASCADE,
         verbose_name='Автор публикации'
     )
+    # Комментарии удалённой публикации удаляет задача
+    # cleanup_deleted_post, а не каскад внутри запроса.
     post = models.ForeignKey(
-        Post, on_delete=models.CASCADE,
+        Post, on_delete=models.DO_NOTHING,
+        db_constraint=False,
         verbose_name='Публикация',
         related_name='comments'
     )
@@ -93,6 +147,41 @@ class Comment(CreatedAt):
     class Meta(CreatedAt.Meta):
         verbose_name = 'коментарий'
         verbose_name_plural = 'коментарии'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text[:MAX_LENGTH_RENDER_TITLE]
+
+
+class AuthorStats(models.Model):
+    """Счётчики автора, которые обновляются при изменениях, а не считаются."""
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='author_stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField('Публикаций', default=0)
+    # Только отметка is_published: отложенные публикации и публикации
+    # в снятых категориях тоже считаются, иначе счётчик пришлось бы
+    # пересчитывать по времени и при изменении категорий.
+    is_published_posts_count = models.PositiveIntegerField(
+        'Публикаций с отметкой «Опубликовано»',
+        default=0,
+        help_text='Включая отложенные и публикации в снятых категориях.'
+    )
+    comments_count = models.PositiveIntegerField('Комментариев', default=0)
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self) -> str:
+        return str(self.user)
@@ -0,0 +1,271 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Max, Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .constants import COUNT_ESTIMATE_SAMPLE, PAGINATION_WINDOW
+
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+def encode_cursor(direction, obj, key_field='pub_date'):
+    """Непрозрачный токен позиции в ленте по ключу (key_field, id)."""
+    raw = f'{direction}|{getattr(obj, key_field).isoformat()}|{obj.pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padding = '=' * (-len(token) % 4)
+        raw = urlsafe_b64decode((token + padding).encode()).decode()
+        direction, key, pk = raw.split('|')
+        if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(key), int(pk)
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        raise Http404('Неверный курсор страницы.')
+
+
+class CursorPage:
+    """Страница ленты, полученная без OFFSET и COUNT(*)."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous,
+                 key_field='pub_date'):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.key_field = key_field
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return encode_cursor(
+            CURSOR_NEXT, self.object_list[-1], self.key_field
+        )
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return encode_cursor(
+            CURSOR_PREVIOUS, self.object_list[0], self.key_field
+        )
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (key_field, id).
+
+    По умолчанию — лента публикаций по pub_date в порядке убывания.
+    """
+
+    def __init__(self, object_list, per_page, key_field='pub_date',
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.key_field = key_field
+        self.descending = descending
+
+    def _ordering(self, descending):
+        sign = '-' if descending else ''
+        return (f'{sign}{self.key_field}', f'{sign}id')
+
+    def _after(self, key, pk, descending):
+        lookup = 'lt' if descending else 'gt'
+        return (
+            Q(**{f'{self.key_field}__{lookup}': key})
+            | Q(**{self.key_field: key, f'pk__{lookup}': pk})
+        )
+
+    def _page(self, rows, has_next, has_previous):
+        return CursorPage(rows, has_next, has_previous, self.key_field)
+
+    def page(self, token=None):
+        if not token:
+            rows = list(
+                self.object_list.order_by(
+                    *self._ordering(self.descending)
+                )[:self.per_page + 1]
+            )
+            return self._page(
+                rows[:self.per_page],
+                has_next=len(rows) > self.per_page,
+                has_previous=False
+            )
+        direction, key, pk = decode_cursor(token)
+        if direction == CURSOR_NEXT:
+            rows = list(
+                self.object_list.filter(
+                    self._after(key, pk, self.descending)
+                ).order_by(
+                    *self._ordering(self.descending)
+                )[:self.per_page + 1]
+            )
+            return self._page(
+                rows[:self.per_page],
+                has_next=len(rows) > self.per_page,
+                has_previous=True
+            )
+        rows = list(
+            self.object_list.filter(
+                self._after(key, pk, not self.descending)
+            ).order_by(
+                *self._ordering(not self.descending)
+            )[:self.per_page + 1]
+        )
+        return self._page(
+            rows[:self.per_page][::-1],
+            has_next=True,
+            has_previous=len(rows) > self.per_page
+        )
+
+
+# Число строк таблицы по статистике планировщика (после ANALYZE).
+TABLE_ROWS_SQL = {
+    'sqlite': (
+        'SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 '
+        'WHERE tbl = %s LIMIT 1'
+    ),
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+}
+
+
+def get_table_rows(model, using):
+    """Примерное число строк таблицы без COUNT(*).
+
+    Берётся из статистики СУБД, а без неё — из MAX(pk), который
+    читается по первичному ключу за одно обращение к индексу.
+    """
+    connection = connections[using]
+    sql = TABLE_ROWS_SQL.get(connection.vendor)
+    if sql is not None:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [model._meta.db_table])
+                row = cursor.fetchone()
+        except DatabaseError:
+            row = None
+        if row and row[0] and row[0] > 0:
+            return row[0]
+    return model._base_manager.using(using).aggregate(
+        rows=Max('pk')
+    )['rows']
+
+
+def estimate_count(queryset, sample_size=COUNT_ESTIMATE_SAMPLE):
+    """Оценка числа строк выборки по доле совпадений среди последних.
+
+    Фильтры проверяются на sample_size строках с наибольшими pk,
+    доля переносится на всю таблицу. Для маленьких таблиц возвращает
+    None: точный COUNT(*) там дешевле.
+    """
+    model = queryset.model
+    table_rows = get_table_rows(model, queryset.db)
+    if not table_rows:
+        return None
+    if not queryset.query.where:
+        return table_rows
+    boundary = model._base_manager.using(queryset.db).order_by(
+        '-pk'
+    ).values_list('pk', flat=True)[sample_size - 1:sample_size].first()
+    if boundary is None:
+        return None
+    matched = queryset.filter(pk__gte=boundary).count()
+    return round(table_rows * matched / sample_size)
+
+
+class WindowedPaginator(Paginator):
+    """Номерная пагинация с окном ссылок вокруг текущей страницы.
+
+    С estimate_count число страниц берётся из estimate_count(), а не
+    из COUNT(*). Страница выбирается с одной лишней строкой: это
+    показывает, есть ли следующая, и уточняет оценку, когда лента
+    заканчивается раньше или позже ожидаемого. Пустая страница в пределах
+    оценки заменяется настоящей последней (last_page).
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, window=PAGINATION_WINDOW,
+                 estimate_count=False, estimate_sample=COUNT_ESTIMATE_SAMPLE):
+        super().__init__(
+            object_list, per_page, orphans, allow_empty_first_page
+        )
+        self.window = window
+        self.estimate_count = estimate_count
+        self.estimate_sample = estimate_sample
+        self.estimated = False
+
+    @cached_property
+    def count(self):
+        if self.estimate_count:
+            estimate = estimate_count(self.object_list, self.estimate_sample)
+            if estimate is not None:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        # Оценка может быть меньше настоящего числа, поэтому страницы
+        # дальше оценки не отбрасываются заранее.
+        if self.count is None or not self.estimated:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не является целым.')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1.')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            if number > self.num_pages:
+                raise EmptyPage('На этой странице нет результатов.')
+            return self.last_page()
+        if len(rows) > self.per_page:
+            self.count = max(self.count, bottom + len(rows))
+        else:
+            self.count = bottom + len(rows)
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(rows[:self.per_page], number, self)
+
+    def last_page(self):
+        """Настоящая последняя страница, когда оценка завысила число.
+
+        Ссылки окна и «Последняя» строятся по оценке и могут вести
+        за конец ленты; вместо пустой страницы число пересчитывается
+        COUNT(*) и отдаётся последняя страница.
+        """
+        self.count = self.object_list.count()
+        self.estimated = False
+        self.__dict__.pop('num_pages', None)
+        return super().page(self.num_pages)
@@ -0,0 +1,176 @@
+import json
+import logging
+import random
+import re
+from collections import Counter, deque
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+from .constants import (
+    PROFILING_BUFFER_SIZE,
+    PROFILING_LOG_BACKUPS,
+    PROFILING_LOG_MAX_BYTES,
+)
+
+# Последние замеры текущего процесса.
+profiles = deque(maxlen=PROFILING_BUFFER_SIZE)
+# Замер текущего запроса; sync_to_async передаёт его и в другие потоки.
+active_profile = ContextVar('active_profile', default=None)
+
+NUMBER_RE = re.compile(r'\b\d+\b')
+
+
+def get_logger():
+    """Журнал замеров: по одной JSON-строке на запрос, с ротацией."""
+    logger = logging.getLogger('blog.profiling')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    path = settings.PROFILING_LOG and str(Path(settings.PROFILING_LOG))
+    for handler in logger.handlers[:]:
+        if handler.baseFilename != path:
+            logger.removeHandler(handler)
+            handler.close()
+    if path and not logger.handlers:
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=PROFILING_LOG_MAX_BYTES,
+            backupCount=PROFILING_LOG_BACKUPS,
+            encoding='utf-8',
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+
+def normalize_sql(sql):
+    """Шаблон запроса без литералов: одинаков у всех итераций N+1."""
+    return NUMBER_RE.sub('?', sql)
+
+
+class QueryRecorder:
+    """Собирает SQL-запросы всех соединений через execute_wrapper."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                (sql, repr(params), perf_counter() - start)
+            )
+
+    def record(self):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    def get_duplicates(self):
+        """Точные повторы и самый частый шаблон запроса (признак N+1)."""
+        exact = Counter((sql, params) for sql, params, _ in self.queries)
+        similar = Counter(
+            normalize_sql(sql) for sql, _, _ in self.queries
+        ).most_common(1)
+        pattern, repeats = similar[0] if similar else ('', 0)
+        return {
+            'duplicates': sum(count - 1 for count in exact.values()),
+            'similar': repeats,
+            'similar_sql': pattern if repeats > 1 else '',
+        }
+
+
+def record_queries():
+    """Добавляет запросы текущего потока в замер запроса.
+
+    Потоки sync_to_async(thread_sensitive=False) открывают свои
+    соединения, которые ProfilingMiddleware не оборачивает.
+    """
+    profile = active_profile.get()
+    if profile is None:
+        return nullcontext()
+    return profile['recorder'].record()
+
+
+_template_render = Template.render
+
+
+def timed_render(self, context):
+    """Template.render, засекающий время внешнего шаблона замера.
+
+    Вложенные шаблоны ({% include %}) входят во время внешнего.
+    """
+    profile = active_profile.get()
+    if profile is None or profile['rendering']:
+        return _template_render(self, context)
+    profile['rendering'] = True
+    start = perf_counter()
+    try:
+        return _template_render(self, context)
+    finally:
+        profile['render'] += perf_counter() - start
+        profile['rendering'] = False
+
+
+class ProfilingMiddleware:
+    """Выборочно замеряет запросы: SQL, рендеринг шаблона, размер ответа.
+
+    Включается настройкой PROFILING; доля замеряемых запросов —
+    PROFILING_SAMPLE_RATE. Замеры копятся в profiles и пишутся
+    в журнал PROFILING_LOG для команды profile_report.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.logger = get_logger()
+        # Время шаблона засекается и у render() в функциях-представлениях.
+        Template.render = timed_render
+
+    def __call__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        measure = {'render': 0.0, 'rendering': False, 'recorder': recorder}
+        token = active_profile.set(measure)
+        start = perf_counter()
+        try:
+            with recorder.record():
+                response = self.get_response(request)
+        finally:
+            active_profile.reset(token)
+        profile = {
+            'view': self.get_view_name(request),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration': perf_counter() - start,
+            'queries': len(recorder.queries),
+            'sql_time': sum(duration for *_, duration in recorder.queries),
+            'render': measure['render'],
+            'size': (
+                None if response.streaming else len(response.content)
+            ),
+            **recorder.get_duplicates(),
+        }
+        profiles.append(profile)
+        self.logger.info(json.dumps(profile, ensure_ascii=False))
+        return response
+
+    @staticmethod
+    def get_view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '-'
+        return match.view_name or match._func_path
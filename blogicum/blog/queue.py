@@ -0,0 +1,296 @@
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .constants import (
+    TASK_MAX_ATTEMPTS, TASK_POLL_INTERVAL, TASK_RETRY_DELAY,
+    TASK_VISIBILITY_TIMEOUT
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """Вызов задачи с аргументами и числом выполненных попыток."""
+
+    def __init__(self, name, args=(), kwargs=None, attempts=0, pk=None):
+        self.name = name
+        self.args = list(args)
+        self.kwargs = kwargs or {}
+        self.attempts = attempts
+        self.pk = pk
+
+    def dumps(self):
+        return json.dumps({'args': self.args, 'kwargs': self.kwargs})
+
+
+class MemoryBackend:
+    """Очередь в памяти процесса; задачи теряются при перезапуске."""
+
+    def __init__(self):
+        self.jobs = []
+        self.dead = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+
+    def push(self, job, delay=0):
+        with self.condition:
+            heapq.heappush(
+                self.jobs, (time.monotonic() + delay, next(self.counter), job)
+            )
+            self.condition.notify()
+
+    def pop(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.jobs and self.jobs[0][0] <= now:
+                    return heapq.heappop(self.jobs)[2]
+                if now >= deadline:
+                    return None
+                wait = deadline - now
+                if self.jobs:
+                    wait = min(wait, self.jobs[0][0] - now)
+                self.condition.wait(wait)
+
+    def ack(self, job):
+        pass
+
+    def bury(self, job, error):
+        self.dead.append((job, error))
+
+    def size(self):
+        return len(self.jobs)
+
+
+class SQLiteBackend:
+    """Надёжная очередь в отдельном файле SQLite.
+
+    Взятая задача блокируется на TASK_VISIBILITY_TIMEOUT секунд: если
+    обработчик упадёт, не подтвердив её, задачу возьмёт другой.
+    Исчерпавшие попытки задачи остаются в таблице с текстом ошибки.
+    """
+
+    table = 'task_queue'
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+        self.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'name TEXT NOT NULL, payload TEXT NOT NULL, '
+            'attempts INTEGER NOT NULL DEFAULT 0, '
+            'run_at REAL, locked_until REAL NOT NULL DEFAULT 0, '
+            'error TEXT)'
+        )
+        self.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_run_at_idx '
+            f'ON {self.table} (run_at)'
+        )
+
+    def connect(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            self.local.connection = connection
+        return connection
+
+    def execute(self, sql, params=()):
+        return self.connect().execute(sql, params)
+
+    def push(self, job, delay=0):
+        run_at = time.time() + delay
+        if job.pk is None:
+            job.pk = self.execute(
+                f'INSERT INTO {self.table} (name, payload, attempts, run_at) '
+                'VALUES (?, ?, ?, ?)',
+                (job.name, job.dumps(), job.attempts, run_at)
+            ).lastrowid
+        else:
+            self.execute(
+                f'UPDATE {self.table} '
+                'SET attempts = ?, run_at = ?, locked_until = 0 '
+                'WHERE id = ?',
+                (job.attempts, run_at, job.pk)
+            )
+
+    def claim(self):
+        now = time.time()
+        connection = self.connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                f'SELECT id, name, payload, attempts FROM {self.table} '
+                'WHERE run_at <= ? AND locked_until <= ? '
+                'ORDER BY run_at LIMIT 1',
+                (now, now)
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    f'UPDATE {self.table} SET locked_until = ? WHERE id = ?',
+                    (now + TASK_VISIBILITY_TIMEOUT, row[0])
+                )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        if row is None:
+            return None
+        pk, name, payload, attempts = row
+        payload = json.loads(payload)
+        return Job(name, payload['args'], payload['kwargs'], attempts, pk)
+
+    def pop(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.claim()
+            if job is not None or time.monotonic() >= deadline:
+                return job
+            time.sleep(TASK_POLL_INTERVAL)
+
+    def ack(self, job):
+        self.execute(f'DELETE FROM {self.table} WHERE id = ?', (job.pk,))
+
+    def bury(self, job, error):
+        self.execute(
+            f'UPDATE {self.table} '
+            'SET attempts = ?, run_at = NULL, error = ? WHERE id = ?',
+            (job.attempts, error, job.pk)
+        )
+
+    def size(self):
+        return self.execute(
+            f'SELECT COUNT(*) FROM {self.table} WHERE run_at IS NOT NULL'
+        ).fetchone()[0]
+
+
+class TaskQueue:
+    """Очередь фоновых задач с повторами и счётчиками.
+
+    Задача ставится в очередь после фиксации транзакции. В режиме
+    ``memory`` её выполняют потоки веб-процесса, в режиме ``sqlite`` —
+    команда ``run_tasks`` (и потоки, если TASK_QUEUE_WORKERS > 0).
+    """
+
+    def __init__(self):
+        self.registry = {}
+        self.metrics = Counter()
+        self.lock = threading.Lock()
+        self.threads = []
+        self._backend = None
+
+    @property
+    def backend(self):
+        with self.lock:
+            if self._backend is None:
+                if settings.TASK_QUEUE_BACKEND == 'sqlite':
+                    self._backend = SQLiteBackend(settings.TASK_QUEUE_PATH)
+                else:
+                    self._backend = MemoryBackend()
+            return self._backend
+
+    def register(self, func):
+        name = f'{func.__module__}.{func.__name__}'
+        self.registry[name] = func
+
+        def delay(*args, **kwargs):
+            self.enqueue(name, *args, **kwargs)
+
+        func.delay = delay
+        return func
+
+    def enqueue(self, name, *args, **kwargs):
+        job = Job(name, args, kwargs)
+        transaction.on_commit(lambda: self.push(job))
+
+    def push(self, job):
+        self.backend.push(job)
+        self.count('enqueued')
+        self.start_workers()
+
+    def count(self, metric, value=1):
+        with self.lock:
+            self.metrics[metric] += value
+
+    def run_job(self, job):
+        close_old_connections()
+        started = time.perf_counter()
+        try:
+            self.registry[job.name](*job.args, **job.kwargs)
+        except Exception as error:
+            job.attempts += 1
+            if job.attempts < TASK_MAX_ATTEMPTS:
+                self.backend.push(
+                    job, delay=TASK_RETRY_DELAY * 2 ** (job.attempts - 1)
+                )
+                self.count('retried')
+            else:
+                logger.exception('Задача %s не выполнена', job.name)
+                self.backend.bury(job, repr(error))
+                self.count('failed')
+        else:
+            self.backend.ack(job)
+            self.count('succeeded')
+        finally:
+            self.count('run_time', time.perf_counter() - started)
+            close_old_connections()
+
+    def work(self, burst=False, stop=None):
+        """Выполняет задачи; в режиме burst — пока очередь не опустеет."""
+        processed = 0
+        while stop is None or not stop.is_set():
+            job = self.backend.pop(0 if burst else TASK_POLL_INTERVAL)
+            if job is None:
+                if burst:
+                    break
+                continue
+            self.run_job(job)
+            processed += 1
+        return processed
+
+    def start_workers(self):
+        # SQLite в памяти не ждёт снятия блокировок таблиц: запись из
+        # потока обработчика обрывает параллельный запрос с ошибкой.
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            return
+        with self.lock:
+            if self.threads:
+                return
+            for number in range(settings.TASK_QUEUE_WORKERS):
+                thread = threading.Thread(
+                    target=self.work,
+                    name=f'task-worker-{number}',
+                    daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+
+    def stats(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+        runs = metrics.get('succeeded', 0) + metrics.get('failed', 0) + (
+            metrics.get('retried', 0)
+        )
+        metrics['pending'] = self.backend.size()
+        metrics['avg_run_ms'] = round(
+            metrics.pop('run_time', 0) * 1000 / runs, 2
+        ) if runs else 0
+        return metrics
+
+
+task_queue = TaskQueue()
+task = task_queue.register
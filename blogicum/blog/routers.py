@@ -0,0 +1,45 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Псевдоним реплики для чтения в текущем запросе; None — основная БД.
+read_database = ContextVar('read_database', default=None)
+
+
+def replica_view(view):
+    """Помечает представление как только читающее."""
+    view.use_replica = True
+    return view
+
+
+def uses_replica(view):
+    return getattr(getattr(view, 'view_class', view), 'use_replica', False)
+
+
+def choose_replica():
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    """Чтение в читающих представлениях идёт на реплики, запись — на основную.
+
+    Реплику для запроса выбирает ReplicaRoutingMiddleware.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Все базы проекта — копии одной схемы.
+        if obj1._state.db in settings.DATABASES and (
+            obj2._state.db in settings.DATABASES
+        ):
+            return True
+        return None
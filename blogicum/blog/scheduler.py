@@ -0,0 +1,131 @@
+from datetime import datetime, time
+from threading import Lock, Timer
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.dispatch import Signal
+from django.utils.timezone import localtime, make_aware, now
+
+from .common import get_next_publication_at, get_publication_boundary
+from .constants import PUBLICATION_SCHEDULER_CACHE_ALIAS
+from .models import Post
+
+
+# Отправляется с аргументом post_ids, когда отложенные публикации
+# появляются в лентах.
+post_published = Signal()
+
+
+def get_publication_moment(pub_date):
+    """Момент появления публикации в лентах: начало дня pub_date."""
+    return make_aware(datetime.combine(localtime(pub_date).date(), time.min))
+
+
+class PublicationScheduler:
+    """Планировщик отложенных публикаций.
+
+    Знает ближайший момент появления публикаций и в этот момент
+    отправляет post_published, чтобы кэши сбрасывались ровно тогда,
+    когда меняется содержимое лент. Ближайший момент хранится в кэше
+    до этого момента и пересчитывается при изменении публикаций.
+    В production оповещения рассылает команда publish_scheduled --loop,
+    запущенная отдельным процессом; её сбросы видны веб-процессам только
+    с общими кэшами (CACHE_PROFILE=shared). Таймер внутри веб-процесса
+    (PUBLICATION_TIMER) по умолчанию выключен.
+    """
+
+    key_prefix = 'publication'
+    none = 'none'
+
+    def __init__(self, alias=PUBLICATION_SCHEDULER_CACHE_ALIAS):
+        self.alias = alias
+        self.lock = Lock()
+        self.timer = None
+        self.timer_at = None
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_next_at(self):
+        """Ближайший момент появления публикаций или None."""
+        key = f'{self.key_prefix}:next'
+        self.cache.add(
+            f'{self.key_prefix}:boundary', get_publication_boundary(), None
+        )
+        next_at = self.cache.get(key)
+        if next_at is None or self.is_stale(next_at):
+            next_at = get_next_publication_at() or self.none
+            self.cache.set(key, next_at, self.get_timeout(next_at))
+        next_at = None if next_at == self.none else next_at
+        self.arm(next_at)
+        return next_at
+
+    def is_stale(self, next_at):
+        """Прошедший момент: run_due мог ещё не сработать."""
+        return next_at != self.none and next_at <= now()
+
+    def get_timeout(self, next_at):
+        if next_at == self.none:
+            return None
+        return int((next_at - now()).total_seconds()) + 1
+
+    def reschedule(self):
+        self.cache.delete(f'{self.key_prefix}:next')
+        if settings.PUBLICATION_TIMER:
+            self.get_next_at()
+
+    def get_upcoming(self):
+        return Post.objects.select_related(
+            'author', 'category'
+        ).filter(
+            is_published=True,
+            pub_date__gte=get_publication_boundary()
+        ).order_by('pub_date')
+
+    def run_due(self):
+        """Оповещает о публикациях, появившихся с прошлого запуска."""
+        key = f'{self.key_prefix}:boundary'
+        boundary = get_publication_boundary()
+        since = self.cache.get(key)
+        post_ids = []
+        if since is not None and since < boundary:
+            post_ids = list(Post.objects.filter(
+                is_published=True,
+                category__is_published=True,
+                pub_date__gte=since,
+                pub_date__lt=boundary
+            ).values_list('pk', flat=True))
+        self.cache.set(key, boundary, None)
+        if since is None or since < boundary:
+            self.cache.delete(f'{self.key_prefix}:next')
+        if post_ids:
+            post_published.send(sender=Post, post_ids=post_ids)
+        return post_ids
+
+    def arm(self, next_at):
+        if not settings.PUBLICATION_TIMER or next_at is None:
+            return
+        with self.lock:
+            if self.timer is not None and self.timer_at == next_at:
+                return
+            if self.timer is not None:
+                self.timer.cancel()
+            delay = max(0, (next_at - now()).total_seconds())
+            self.timer = Timer(delay, self.fire)
+            self.timer.daemon = True
+            self.timer_at = next_at
+            self.timer.start()
+
+    def fire(self):
+        with self.lock:
+            self.timer = self.timer_at = None
+        try:
+            self.run_due()
+            self.get_next_at()
+        finally:
+            close_old_connections()
+
+
+publication_scheduler = PublicationScheduler()
@@ -0,0 +1,216 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .common import filter_objects_published, get_feed_objects
+from .constants import SEARCH_RESULTS_LIMIT
+from .models import Post
+
+
+WORD_RE = re.compile(r'\w+')
+
+
+def get_document(post):
+    """Поля публикации, попадающие в поисковый индекс."""
+    return {
+        'title': post.title,
+        'text': post.text,
+        'category': post.category.title if post.category else '',
+        'location': post.location.name if post.location else '',
+    }
+
+
+class SQLiteSearchBackend:
+    """Инвертированный индекс на виртуальной таблице FTS5."""
+
+    table = 'blog_post_fts'
+    # Вес столбцов для bm25: title, text, category, location.
+    weights = (10.0, 1.0, 3.0, 3.0)
+
+    def create_index(self, cursor):
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+            'title, text, category, location, '
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def drop_index(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def index_post(self, post):
+        document = get_document(post)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {self.table} '
+                '(rowid, title, text, category, location) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [post.pk, *document.values()]
+            )
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post_id]
+            )
+
+    def build_query(self, query):
+        # Каждое слово — префиксный терм в кавычках, поэтому символы
+        # синтаксиса FTS5 из пользовательского ввода не интерпретируются.
+        return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+    def search(self, query, limit=SEARCH_RESULTS_LIMIT):
+        match = self.build_query(query)
+        if not match:
+            return []
+        weights = ', '.join(map(str, self.weights))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} '
+                f'WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, {weights}) LIMIT %s',
+                [match, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """Индекс tsvector с GIN-индексом в отдельной таблице."""
+
+    table = 'blog_post_search'
+    config = 'russian'
+    # Веса tsvector: A — title, D — text, B — category и location.
+    weights = (('title', 'A'), ('text', 'D'), ('category', 'B'),
+               ('location', 'B'))
+
+    def create_index(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'post_id bigint PRIMARY KEY '
+            'REFERENCES blog_post (id) ON DELETE CASCADE, '
+            'document tsvector NOT NULL)'
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_document_idx '
+            f'ON {self.table} USING GIN (document)'
+        )
+
+    def drop_index(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def index_post(self, post):
+        document = get_document(post)
+        vector = ' || '.join(
+            f"setweight(to_tsvector('{self.config}', %s), '{weight}')"
+            for _, weight in self.weights
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table} (post_id, document) '
+                f'VALUES (%s, {vector}) '
+                'ON CONFLICT (post_id) '
+                'DO UPDATE SET document = EXCLUDED.document',
+                [post.pk, *(document[field] for field, _ in self.weights)]
+            )
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE post_id = %s', [post_id]
+            )
+
+    def search(self, query, limit=SEARCH_RESULTS_LIMIT):
+        if not WORD_RE.search(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT post_id FROM {self.table}, '
+                f"websearch_to_tsquery('{self.config}', %s) query "
+                'WHERE document @@ query '
+                'ORDER BY ts_rank(document, query) DESC LIMIT %s',
+                [query, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class LikeSearchBackend:
+    """Запасной вариант без индекса для прочих СУБД."""
+
+    def create_index(self, cursor):
+        pass
+
+    def drop_index(self, cursor):
+        pass
+
+    def index_post(self, post):
+        pass
+
+    def remove_post(self, post_id):
+        pass
+
+    def search(self, query, limit=SEARCH_RESULTS_LIMIT):
+        words = WORD_RE.findall(query)
+        if not words:
+            return []
+        posts = Post.objects.all()
+        for word in words:
+            posts = posts.filter(
+                Q(title__icontains=word) | Q(text__icontains=word)
+            )
+        return list(posts.values_list('pk', flat=True)[:limit])
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    return SEARCH_BACKENDS.get(vendor, LikeSearchBackend)()
+
+
+def rebuild_index():
+    """Полностью перестраивает индекс; возвращает число публикаций."""
+    backend = get_search_backend()
+    with connection.cursor() as cursor:
+        backend.drop_index(cursor)
+        backend.create_index(cursor)
+    total = 0
+    for post in Post.objects.select_related(
+        'category', 'location'
+    ).iterator():
+        backend.index_post(post)
+        total += 1
+    return total
+
+
+class SearchResults:
+    """Ранжированные результаты поиска для Paginator.
+
+    Публикации с полями для карточки загружаются только для среза
+    текущей страницы.
+    """
+
+    def __init__(self, query):
+        ranked_ids = get_search_backend().search(query)
+        visible = set(
+            filter_objects_published(
+                Post.objects.filter(pk__in=ranked_ids)
+            ).values_list('pk', flat=True)
+        )
+        self.ids = [pk for pk in ranked_ids if pk in visible]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        is_slice = isinstance(index, slice)
+        ids = self.ids[index] if is_slice else [self.ids[index]]
+        posts = get_feed_objects(Post.objects).in_bulk(ids)
+        results = [posts[pk] for pk in ids if pk in posts]
+        return results if is_slice else results[0]
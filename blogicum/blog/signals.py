@@ -0,0 +1,298 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import Subquery
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from .cache import feed_page_cache, post_card_cache
+from .common import change_comment_count
+from .constants import FEED_COUNT_FIELDS
+from .counts import feed_count_cache, get_count_scopes
+from .images import derivatives_exist
+from .models import AuthorStats, Category, Comment, Location, Post
+from .scheduler import post_published, publication_scheduler
+from .search import get_search_backend
+from .stats import change_author_stats, is_post_deleting
+from .tasks import (
+    cleanup_deleted_post,
+    process_post_image,
+    reindex_related_posts,
+)
+
+
+User = get_user_model()
+
+
+def bump_post_cards(kind, pk):
+    """Сдвигает версию сразу и повторно после фиксации транзакции.
+
+    Повторный сдвиг отбрасывает карточку, которую параллельный запрос
+    мог отрисовать по ещё не зафиксированным данным.
+    """
+    post_card_cache.bump(kind, pk)
+    transaction.on_commit(lambda: post_card_cache.bump(kind, pk))
+
+
+def bump_feed_pages(*scopes):
+    """Сбрасывает страницы лент; без областей — все ленты сразу."""
+    scopes = scopes or (feed_page_cache.global_scope,)
+    feed_page_cache.bump(*scopes)
+    transaction.on_commit(lambda: feed_page_cache.bump(*scopes))
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and settings.SQLITE_PRAGMAS:
+        with connection.cursor() as cursor:
+            apply_sqlite_pragmas(cursor, settings.SQLITE_PRAGMAS)
+
+
+@receiver((post_save, post_delete), sender=Post)
+def post_changed(sender, instance, **kwargs):
+    bump_post_cards('post', instance.pk)
+    bump_feed_pages()
+    transaction.on_commit(publication_scheduler.reschedule)
+
+
+@receiver(post_published, sender=Post)
+def post_became_visible(sender, post_ids, **kwargs):
+    for pk in post_ids:
+        post_card_cache.bump('post', pk)
+    feed_page_cache.bump_all()
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    if is_post_deleting(instance):
+        return
+    Post.objects.filter(pk=instance.post_id).update(updated_at=now())
+    bump_post_cards('post', instance.post_id)
+    # Имя комментатора приходит тем же запросом, а не загрузкой
+    # instance.author на каждый комментарий.
+    post = Post.objects.filter(pk=instance.post_id).values(
+        'category__slug', 'author__username'
+    ).annotate(commenter=Subquery(
+        User.objects.filter(pk=instance.author_id).values('username')
+    )).first()
+    if post is None:
+        return
+    bump_feed_pages(
+        'index',
+        f'category:{post["category__slug"]}',
+        f'author:{post["author__username"]}',
+        # Страница комментатора показывает его счётчик комментариев.
+        f'author:{post["commenter"]}'
+    )
+
+
+@receiver((post_save, post_delete), sender=Category)
+def category_changed(sender, instance, **kwargs):
+    bump_post_cards('category', instance.pk)
+    bump_feed_pages()
+    feed_count_cache.bump()
+
+
+@receiver((post_save, post_delete), sender=Location)
+def location_changed(sender, instance, **kwargs):
+    bump_post_cards('location', instance.pk)
+    bump_feed_pages()
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._count_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_post_cards('author', instance.pk)
+    bump_feed_pages()
+    # Счётчики лент автора хранятся в области с его именем.
+    if instance._count_username not in (None, instance.username):
+        feed_count_cache.bump()
+    instance._count_username = instance.username
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    get_search_backend().index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def cleanup_post(sender, instance, **kwargs):
+    cleanup_deleted_post.delay(instance.pk, instance.image.name or None)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def queue_related_posts_reindex(sender, instance, created, **kwargs):
+    if not created:
+        reindex_related_posts.delay(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_image(sender, instance, **kwargs):
+    image = instance.__dict__.get('image')
+    instance._image_name = getattr(image, 'name', image)
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_image(sender, instance, created, **kwargs):
+    name = instance.image.name
+    changed = created or name != instance._image_name
+    instance._image_name = name
+    if name and changed and not derivatives_exist(name):
+        process_post_image.delay(instance.pk, name)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_stats_state(sender, instance, **kwargs):
+    # Значения берутся из __dict__: отложенные поля не должны подгружаться.
+    instance._stats_state = (
+        instance.__dict__.get('author_id'),
+        instance.__dict__.get('is_published')
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_post_author_stats(sender, instance, created, **kwargs):
+    old_author, old_published = (
+        (None, False) if created else instance._stats_state
+    )
+    author, published = instance.author_id, instance.is_published
+    if old_published is None:
+        old_published = published
+    if old_author in (None, author) and not created:
+        change_author_stats(
+            author, is_published_posts_count=published - old_published
+        )
+    else:
+        change_author_stats(
+            old_author, posts_count=-1, is_published_posts_count=-old_published
+        )
+        change_author_stats(
+            author, posts_count=1, is_published_posts_count=int(published)
+        )
+    instance._stats_state = (author, published)
+
+
+@receiver(post_delete, sender=Post)
+def update_deleted_post_author_stats(sender, instance, **kwargs):
+    change_author_stats(
+        instance.author_id,
+        posts_count=-1,
+        is_published_posts_count=-int(instance.is_published)
+    )
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_stats_state(sender, instance, **kwargs):
+    instance._stats_author = instance.__dict__.get('author_id')
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_author_stats(sender, instance, created, **kwargs):
+    old_author = None if created else instance._stats_author
+    if not created and old_author is None:
+        return
+    if old_author != instance.author_id:
+        change_author_stats(old_author, comments_count=-1)
+        change_author_stats(instance.author_id, comments_count=1)
+    instance._stats_author = instance.author_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_deleted_comment_author_stats(sender, instance, **kwargs):
+    if is_post_deleting(instance):
+        return
+    change_author_stats(instance.author_id, comments_count=-1)
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance._count_post = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count(sender, instance, created, **kwargs):
+    old_post = None if created else instance._count_post
+    if old_post != instance.post_id:
+        if old_post is not None:
+            change_comment_count(old_post, -1)
+        change_comment_count(instance.post_id, 1)
+    instance._count_post = instance.post_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_deleted_comment_count(sender, instance, **kwargs):
+    if not is_post_deleting(instance):
+        change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.objects.get_or_create(user=instance)
+
+
+def get_count_fields(post):
+    # Отложенные only() поля не загружаются ради сравнения.
+    return {name: post.__dict__.get(name) for name in FEED_COUNT_FIELDS}
+
+
+@receiver(post_init, sender=Post)
+def remember_post_count_fields(sender, instance, **kwargs):
+    instance._count_fields = get_count_fields(instance)
+
+
+@receiver((pre_save, pre_delete), sender=Post)
+def remember_feed_membership(sender, instance, signal, **kwargs):
+    instance._count_queries = None
+    if signal is pre_save and not instance._state.adding and (
+        get_count_fields(instance) == instance._count_fields
+    ):
+        # Ленты отбирают публикации только по этим полям.
+        return
+    old_fields = instance._count_fields
+    instance._count_queries = feed_count_cache.get_queries(get_count_scopes(
+        {old_fields['category_id'], instance.category_id} - {None},
+        {old_fields['author_id'], instance.author_id} - {None}
+    ))
+    instance._feed_membership = set() if instance._state.adding else (
+        feed_count_cache.get_membership(
+            Post, instance.pk, instance._count_queries
+        )
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_feed_counts(sender, instance, **kwargs):
+    if instance._count_queries is not None:
+        feed_count_cache.apply(
+            instance._feed_membership,
+            feed_count_cache.get_membership(
+                Post, instance.pk, instance._count_queries
+            )
+        )
+    instance._count_fields = get_count_fields(instance)
+
+
+@receiver(post_delete, sender=Post)
+def update_deleted_post_feed_counts(sender, instance, **kwargs):
+    feed_count_cache.apply(instance._feed_membership, set())
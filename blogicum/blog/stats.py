@@ -0,0 +1,102 @@
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .cache import feed_page_cache
+from .models import AuthorStats, Comment, Post, User
+
+# Публикации, комментарии которых сейчас удаляет delete_post_comments.
+deleting_posts = ContextVar('deleting_posts', default=frozenset())
+
+
+def count_author_stats(user_id):
+    """Счётчики автора, посчитанные по всей истории."""
+    posts = Post.objects.filter(author_id=user_id).aggregate(
+        posts_count=Count('pk'),
+        is_published_posts_count=Count('pk', filter=Q(is_published=True))
+    )
+    return {
+        **posts,
+        'comments_count': Comment.objects.filter(author_id=user_id).count(),
+    }
+
+
+def change_author_stats(user_id, **deltas):
+    """Атомарно сдвигает счётчики автора.
+
+    Строки ещё нет — она создаётся по полному подсчёту, если счётчики
+    растут. Уменьшение без строки пропускается: так удаление
+    пользователя каскадом не создаёт для него новую строку.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if user_id is None or not deltas:
+        return
+    updated = AuthorStats.objects.filter(user_id=user_id).update(**{
+        field: F(field) + delta for field, delta in deltas.items()
+    })
+    if not updated and any(delta > 0 for delta in deltas.values()):
+        AuthorStats.objects.get_or_create(
+            user_id=user_id, defaults=count_author_stats(user_id)
+        )
+
+
+def is_post_deleting(comment):
+    """Комментарий удаляется вместе с публикацией в delete_post_comments."""
+    return comment.post_id in deleting_posts.get()
+
+
+def delete_post_comments(post_id):
+    """Удаляет комментарии удалённой публикации со всеми побочными эффектами.
+
+    Счётчики комментаторов сдвигаются одним запросом на автора,
+    страницы их профилей сбрасываются разом; обработчики отдельных
+    комментариев такие комментарии пропускают.
+    """
+    commenters = Comment.objects.filter(post_id=post_id).order_by().values(
+        'author', 'author__username'
+    ).annotate(total=Count('pk'))
+    token = deleting_posts.set(deleting_posts.get() | {post_id})
+    try:
+        with transaction.atomic():
+            for row in commenters:
+                change_author_stats(
+                    row['author'], comments_count=-row['total']
+                )
+                feed_page_cache.bump(f'author:{row["author__username"]}')
+            Comment.objects.filter(post_id=post_id).delete()
+    finally:
+        deleting_posts.reset(token)
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.order_by().values('author').annotate(
+                total=Count('pk')
+            ).values('total'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def rebuild_author_stats():
+    """Пересчитывает счётчики всех авторов; возвращает число строк."""
+    posts = Post.objects.filter(author=OuterRef('pk'))
+    users = User.objects.annotate(
+        stats_posts=_count(posts),
+        stats_published=_count(posts.filter(is_published=True)),
+        stats_comments=_count(Comment.objects.filter(author=OuterRef('pk')))
+    ).values_list('pk', 'stats_posts', 'stats_published', 'stats_comments')
+    AuthorStats.objects.all().delete()
+    return len(AuthorStats.objects.bulk_create(
+        AuthorStats(
+            user_id=pk,
+            posts_count=posts_count,
+            is_published_posts_count=published,
+            comments_count=comments
+        )
+        for pk, posts_count, published, comments in users.iterator()
+    ))
@@ -0,0 +1,48 @@
+from django.core.files.storage import default_storage
+from django.core.mail import EmailMultiAlternatives
+
+from .cache import feed_page_cache, post_card_cache
+from .images import generate_derivatives, get_derivative_names
+from .models import Post
+from .queue import task
+from .search import get_search_backend
+from .stats import delete_post_comments
+
+
+@task
+def send_email(subject, body, from_email, to, html=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html is not None:
+        message.attach_alternative(html, 'text/html')
+    message.send()
+
+
+@task
+def process_post_image(post_id, name):
+    generate_derivatives(name)
+    post_card_cache.bump('post', post_id)
+    feed_page_cache.bump_all()
+
+
+@task
+def reindex_related_posts(field, pk):
+    """Переиндексирует публикации изменённой категории или места."""
+    backend = get_search_backend()
+    for post in Post.objects.filter(**{field: pk}).select_related(
+        'category', 'location'
+    ).iterator():
+        backend.index_post(post)
+
+
+@task
+def cleanup_deleted_post(post_id, image_name=None):
+    delete_post_comments(post_id)
+    get_search_backend().remove_post(post_id)
+    if not image_name:
+        return
+    names = [image_name]
+    for derivatives in get_derivative_names(image_name).values():
+        names.extend(derivatives)
+    for name in names:
+        if default_storage.exists(name):
+            default_storage.delete(name)
@@ -0,0 +1,53 @@
+import logging
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+
+from .constants import TEMPLATE_PRECOMPILE_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+
+def get_template_dirs(engine):
+    """Каталоги, в которых ищут шаблоны загрузчики движка."""
+    dirs = []
+    for loader in engine.template_loaders:
+        for inner in getattr(loader, 'loaders', [loader]):
+            dirs.extend(inner.get_dirs())
+    return dirs
+
+
+def iter_template_names(engine):
+    seen = set()
+    for directory in get_template_dirs(engine):
+        for path in sorted(Path(directory).rglob('*')):
+            if path.suffix not in TEMPLATE_PRECOMPILE_SUFFIXES:
+                continue
+            name = path.relative_to(directory).as_posix()
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+def precompile_templates():
+    """Разбирает все шаблоны заранее.
+
+    С кэширующим загрузчиком деревья шаблонов остаются в памяти
+    процесса, и первый запрос не тратит время на разбор. Возвращает
+    число шаблонов и список ошибок разбора.
+    """
+    total, errors = 0, []
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for name in iter_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                errors.append((name, error))
+            else:
+                total += 1
+    for name, error in errors:
+        logger.error('Шаблон %s не разобран: %s', name, error)
+    return total, errors
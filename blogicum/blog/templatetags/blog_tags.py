@@ -0,0 +1,43 @@
+from django import template
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from blog.cache import post_card_cache
+from blog.constants import PAGINATION_WINDOW
+from blog.images import get_responsive_sources
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка публикации из фрагментного кэша."""
+    return mark_safe(post_card_cache.get_or_render(
+        post,
+        lambda: get_template('includes/post_card.html').render(
+            {'post': post}
+        )
+    ))
+
+
+@register.inclusion_tag('includes/responsive_image.html')
+def responsive_image(image, variant='feed'):
+    """Изображение публикации со srcset уменьшенных копий."""
+    return {
+        'image': image,
+        'sources': get_responsive_sources(image, variant),
+    }
+
+
+@register.simple_tag
+def page_window(page):
+    """Номера страниц: первая, последняя и окно вокруг текущей.
+
+    Пропуски обозначены Paginator.ELLIPSIS.
+    """
+    paginator = page.paginator
+    return list(paginator.get_elided_page_range(
+        page.number,
+        on_each_side=getattr(paginator, 'window', PAGINATION_WINDOW),
+        on_ends=1
+    ))
@@ -0,0 +1,83 @@
+from io import BytesIO
+
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+
+from .constants import (
+    IMAGE_HEADER_MAX_BYTES, IMAGE_UPLOAD_FIELDS, IMAGE_UPLOAD_FORMATS,
+    IMAGE_UPLOAD_MAX_PIXELS, IMAGE_UPLOAD_MAX_SIZE
+)
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Проверяет изображения по мере поступления данных.
+
+    Заголовок файла разбирается по первым блокам, поэтому неподходящий
+    формат, слишком большие размеры в пикселях и превышение объёма
+    отклоняются до того, как файл будет принят целиком. Ошибки
+    сохраняются в ``request.upload_errors`` для формы.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.active = False
+        self.checked = False
+        self.header = b''
+        if request is not None:
+            request.upload_errors = {}
+
+    def new_file(self, field_name, file_name, content_type, content_length,
+                 charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type,
+                         content_length, charset, content_type_extra)
+        self.active = field_name in IMAGE_UPLOAD_FIELDS
+        self.checked = False
+        self.header = b''
+        if self.active and (content_length or 0) > IMAGE_UPLOAD_MAX_SIZE:
+            self.reject_size()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if start + len(raw_data) > IMAGE_UPLOAD_MAX_SIZE:
+            self.reject_size()
+        if not self.checked:
+            self.header += raw_data
+            self.checked = self.check_header()
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Файл принимают следующие обработчики, неполный заголовок
+        # отклонит проверка ImageField.
+        return None
+
+    def check_header(self):
+        try:
+            image = Image.open(BytesIO(self.header))
+        except Image.DecompressionBombError:
+            self.reject('Изображение слишком большое.')
+        except Exception:
+            if len(self.header) >= IMAGE_HEADER_MAX_BYTES:
+                self.reject('Не удалось распознать изображение.')
+            return False
+        if image.format not in IMAGE_UPLOAD_FORMATS:
+            self.reject(
+                'Допустимые форматы: ' + ', '.join(IMAGE_UPLOAD_FORMATS) + '.'
+            )
+        width, height = image.size
+        if width * height > IMAGE_UPLOAD_MAX_PIXELS:
+            self.reject(f'Изображение слишком большое: {width}×{height}.')
+        self.header = b''
+        return True
+
+    def reject_size(self):
+        self.reject(
+            'Размер файла не должен превышать '
+            f'{filesizeformat(IMAGE_UPLOAD_MAX_SIZE)}.'
+        )
+
+    def reject(self, message):
+        if self.request is not None:
+            self.request.upload_errors[self.field_name] = message
+        raise SkipFile(message)
@@ -20,11 +20,21 @@ urlpatterns = [
         'posts/<int:post_id>/', views.PostDetailView.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryPostsView.as_view(),
         name='category_posts'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'edit/',
         views.UserUpdateView.as_view(),
@@ -1,5 +1,4 @@
 from django.shortcuts import get_object_or_404, render, redirect
-from django.utils import timezone
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import (
     CreateView,
@@ -9,38 +8,59 @@ from django.views.generic import (
     UpdateView
 )
 from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 
-from .mixins import PostMixin
+from .mixins import (
+    AnonymousPageCacheMixin,
+    CommentCountMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    FeedConditionalGetMixin,
+    PostMixin,
+    UploadErrorsMixin,
+    WindowedPaginationMixin
+)
 from .models import Category, Post, User, Comment
 from .forms import PostForm, CommentForm
 from .common import (
-    add_annotations_comments,
     filter_objects_published,
+    filter_post_visible,
+    get_comments_page,
+    get_feed_objects,
     get_objects_related
 )
 from .constants import POSTS_PAGE_LIMIT
+from .search import SearchResults
 
 
-class IndexView(ListView):
+class IndexView(
+    FeedConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CommentCountMixin,
+    CursorPaginationMixin,
+    WindowedPaginationMixin,
+    ListView
+):
     """класс главной страницы."""
 
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTS_PAGE_LIMIT
-    queryset = add_annotations_comments(
-        filter_objects_published(
-            get_objects_related(
+    use_replica = True
+    count_scope = 'index'
+
+    def get_queryset(self):
+        return filter_objects_published(
+            get_feed_objects(
                 Post.objects
             )
         ).order_by(
             '-pub_date'
         )
-    )
 
 
-class CreatePostView(LoginRequiredMixin, CreateView):
+class CreatePostView(LoginRequiredMixin, UploadErrorsMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -54,23 +74,39 @@ class CreatePostView(LoginRequiredMixin, CreateView):
                             kwargs={'username': self.request.user.username})
 
 
-class PostDetailView(DetailView):
+def get_post_validators(post):
+    """Части ETag и время изменения страницы публикации."""
+    modified = [post.updated_at] + [
+        related.updated_at for related in (post.category, post.location)
+        if related is not None
+    ]
+    parts = (
+        post.pk,
+        post.comment_count,
+        post.author.username,
+        *modified
+    )
+    return parts, max(modified)
+
+
+class PostDetailView(ConditionalGetMixin, DetailView):
     """Класс для представления отдельной записи поста."""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    object = None
+    use_replica = True
+
+    def get_validators(self):
+        self.object = self.get_object()
+        return get_post_validators(self.object)
 
     def get_object(self):
-        filters = (
-            Q(pub_date__date__lte=timezone.now())
-            & Q(is_published=True)
-            & Q(category__is_published=True)
-        )
-        if not self.request.user.is_anonymous:
-            filters |= Q(author=self.request.user)
+        if self.object is not None:
+            return self.object
         qs = get_objects_related(
-            Post.objects.filter(filters)
+            filter_post_visible(Post.objects, self.request.user)
         )
         self.post = get_object_or_404(
             qs,
@@ -81,16 +117,51 @@ class PostDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments_page'] = get_comments_page(self.object)
+        context['comments'] = context['comments_page'].object_list
+        return context
+
+
+class PostCommentsView(DetailView):
+    """Фрагмент со следующей порцией комментариев публикации."""
+
+    model = Post
+    template_name = 'includes/comments_list.html'
+    pk_url_kwarg = 'post_id'
+    context_object_name = 'post'
+
+    def get_queryset(self):
+        return filter_post_visible(Post.objects, self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments_page'] = get_comments_page(
+            self.object, self.request.GET.get('cursor')
+        )
+        context['comments'] = context['comments_page'].object_list
         return context
 
 
-class CategoryPostsView(ListView):
+class CategoryPostsView(
+    FeedConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CommentCountMixin,
+    CursorPaginationMixin,
+    WindowedPaginationMixin,
+    ListView
+):
     """Класс вызова шаблона (категории)."""
 
     model = Post
     template_name = 'blog/category.html'
     paginate_by = POSTS_PAGE_LIMIT
+    use_replica = True
+
+    def get_page_cache_scope(self):
+        return f'category:{self.kwargs["category_slug"]}'
+
+    def get_count_scope(self):
+        return f'category:{self.kwargs["category_slug"]}'
 
     def get_queryset(self):
         self.category = get_object_or_404(
@@ -98,11 +169,9 @@ class CategoryPostsView(ListView):
             is_published=True,
             slug=self.kwargs['category_slug']
         )
-        return add_annotations_comments(
-            filter_objects_published(
-                get_objects_related(
-                    self.category.posts
-                )
+        return filter_objects_published(
+            get_feed_objects(
+                self.category.posts
             )
         ).order_by('-pub_date')
 
@@ -113,22 +182,34 @@ def get_context_data(self, **kwargs):
     return context
 
 
-class UserPostsListView(ListView):
+class UserPostsListView(
+    FeedConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    CommentCountMixin,
+    CursorPaginationMixin,
+    WindowedPaginationMixin,
+    ListView
+):
     """Представление пользователя."""
 
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = POSTS_PAGE_LIMIT
+    use_replica = True
+
+    def get_page_cache_scope(self):
+        return f'author:{self.kwargs["username"]}'
+
+    def get_count_scope(self):
+        return f'author:{self.kwargs["username"]}'
 
     def get_queryset(self):
         self.user = get_object_or_404(
-            User,
+            User.objects.select_related('author_stats'),
             username=self.kwargs['username']
         )
-        qs = add_annotations_comments(
-            get_objects_related(
-                self.user.posts
-            )
+        qs = get_feed_objects(
+            self.user.posts
         ).order_by('-pub_date')
         if self.user != self.request.user:
             return filter_objects_published(qs)
@@ -140,6 +221,25 @@ class UserPostsListView(ListView):
         return context
 
 
+class SearchView(ListView):
+    """Полнотекстовый поиск по публикациям."""
+
+    template_name = 'blog/search.html'
+    paginate_by = POSTS_PAGE_LIMIT
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        if not self.query:
+            return []
+        return SearchResults(self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['pagination_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
+
 class UserUpdateView(LoginRequiredMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
@@ -180,7 +280,7 @@ class AddCommentCreateView(
             kwargs={'post_id': self.kwargs['post_id']})
 
 
-class PostUpdateView(PostMixin, UpdateView):
+class PostUpdateView(PostMixin, UploadErrorsMixin, UpdateView):
     """Класс редактирования поста."""
 
     model = Post
@@ -188,12 +288,6 @@ class PostUpdateView(PostMixin, UpdateView):
     form_class = PostForm
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, id=kwargs['post_id'])
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self):
         return reverse_lazy('blog:post_detail',
                             kwargs={'post_id': self.object.id})
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,6 +26,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -32,6 +34,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -40,6 +43,23 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 MEDIA_ROOT = BASE_DIR / 'media'
+TASK_QUEUE_BACKEND = os.getenv('TASK_QUEUE', 'memory')
+TASK_QUEUE_PATH = BASE_DIR / 'task_queue.sqlite3'
+TASK_QUEUE_WORKERS = int(os.getenv(
+    'TASK_QUEUE_WORKERS', 2 if TASK_QUEUE_BACKEND == 'memory' else 0
+))
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', '0') == '1'
+# Таймер отложенных публикаций в веб-процессе; в production вместо него
+# запускается manage.py publish_scheduled --loop с CACHE_PROFILE=shared.
+PUBLICATION_TIMER = os.getenv('PUBLICATION_TIMER', '0') == '1'
+PROFILING = os.getenv('PROFILING', '0') == '1'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '1'))
+PROFILING_LOG = BASE_DIR / 'profiling.log'
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploads.ImageUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static'
@@ -48,11 +68,36 @@ LOGIN_REDIRECT_URL = 'blog:index'
 LOGIN_URL = 'login'
 
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+TEMPLATE_PROFILES = {
+    # Загрузчики выбирает Django: кэширующий только при DEBUG=False.
+    'default': {
+        'APP_DIRS': True,
+        'OPTIONS': {},
+        'PRECOMPILE': False,
+    },
+    # Разобранные шаблоны всегда хранятся в памяти и разбираются
+    # при запуске, а не первым запросом.
+    'production': {
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ],
+        },
+        'PRECOMPILE': True,
+    },
+}
+TEMPLATE_PROFILE = TEMPLATE_PROFILES[os.getenv('TEMPLATE_PROFILE', 'default')]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
+        'APP_DIRS': TEMPLATE_PROFILE['APP_DIRS'],
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -60,19 +105,110 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            **TEMPLATE_PROFILE['OPTIONS'],
         },
     },
 ]
+TEMPLATE_PRECOMPILE = TEMPLATE_PROFILE['PRECOMPILE']
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
+POST_CARD_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'post-cards',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'post_cards',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+# Профили кэшей: local — в памяти каждого процесса, shared — файлы,
+# общие для всех процессов на сервере. Команде publish_scheduled нужен
+# shared: иначе сброс лент и ближайший момент публикации меняются только
+# в её собственной памяти, и веб-процессы их не видят.
+CACHE_PROFILES = {
+    'local': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'post_cards': POST_CARD_CACHE_BACKENDS[
+            os.getenv('POST_CARD_CACHE', 'locmem')
+        ],
+        'feed_pages': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'feed-pages',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        },
+    },
+    'shared': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache' / 'default',
+        },
+        'post_cards': POST_CARD_CACHE_BACKENDS['file'],
+        'feed_pages': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache' / 'feed_pages',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        },
+    },
+}
+CACHES = CACHE_PROFILES[os.getenv('CACHE_PROFILE', 'local')]
+
+
+DATABASE_PROFILES = {
+    'default': {
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {},
+        'PRAGMAS': {},
+    },
+    # Постоянные соединения и WAL: читатели не блокируют запись,
+    # а конкурирующая запись ждёт busy_timeout вместо ошибки
+    # "database is locked".
+    'production': {
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {'timeout': 20},
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 20000,
+            'cache_size': -64000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+DATABASE_PROFILE = DATABASE_PROFILES[os.getenv('DATABASE_PROFILE', 'default')]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': DATABASE_PROFILE['CONN_MAX_AGE'],
+        'OPTIONS': DATABASE_PROFILE['OPTIONS'],
     }
 }
+SQLITE_PRAGMAS = DATABASE_PROFILE['PRAGMAS']
+
+# Реплики для чтения: пути к файлам через запятую в DATABASE_REPLICAS.
+# В тестах реплики подменяются основной БД (MIRROR).
+DATABASE_REPLICAS = []
+for number, path in enumerate(filter(None, os.getenv(
+    'DATABASE_REPLICAS', ''
+).split(','))):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
 
 
 AUTH_PASSWORD_VALIDATORS = [
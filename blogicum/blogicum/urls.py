@@ -1,14 +1,25 @@
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.views import PasswordResetView
 from django.views.generic.edit import CreateView
 from django.conf.urls.static import static
 from django.conf import settings
 from django.urls import path, include, reverse_lazy
 
+from blog.forms import QueuedPasswordResetForm
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', include('blog.urls')),
+    path(
+        '',
+        include('blog.async_urls' if settings.ASYNC_VIEWS else 'blog.urls')
+    ),
     path('pages/', include('pages.urls')),
+    path(
+        'auth/password_reset/',
+        PasswordResetView.as_view(form_class=QueuedPasswordResetForm),
+        name='password_reset',
+    ),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
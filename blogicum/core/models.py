@@ -9,7 +9,14 @@ class CreatedAt(models.Model):
         ordering = ('created_at',)
 
 
-class IsPublishedCreatedAt(CreatedAt):
+class UpdatedAt(models.Model):
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class IsPublishedCreatedAt(CreatedAt, UpdatedAt):
     is_published = models.BooleanField(
         'Опубликовано',
         default=True,
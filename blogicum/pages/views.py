@@ -7,12 +7,14 @@ class AboutView(TemplateView):
     """Класс вызова шаблона (про нас)."""
 
     template_name = 'pages/about.html'
+    use_replica = True
 
 
 class RulesView(TemplateView):
     """Класс вызова шаблона (наши правила)."""
 
     template_name = 'pages/rules.html'
+    use_replica = True
 
 
 def page_not_found(request, exception) -> HttpResponse:
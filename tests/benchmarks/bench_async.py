@@ -0,0 +1,145 @@
+"""Пропускная способность лент при одновременных запросах.
+
+Сравниваются три пути: WSGI с пулом потоков и синхронными
+представлениями, ASGI с синхронными представлениями и ASGI
+с асинхронными (blog.async_urls). ASGI-запросы идут из одного цикла
+событий, как у uvicorn.
+
+Запуск (BENCH_REQUESTS — запросов на адрес, BENCH_CONCURRENCY —
+одновременных запросов):
+
+    pytest tests/benchmarks/bench_async.py
+
+Результаты пишутся в BENCH_OUTPUT_DIR/async-*.json.
+"""
+import asyncio
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+
+from bench_utils import (
+    BENCH_COMMENTS,
+    BENCH_POSTS,
+    BENCH_USERS,
+    percentile,
+    seeded_django_db_setup,
+    write_report,
+)
+
+BENCH_REQUESTS = int(os.getenv("BENCH_REQUESTS", 200))
+BENCH_CONCURRENCY = int(os.getenv("BENCH_CONCURRENCY", 20))
+
+# Асинхронные представления читают БД из других потоков, поэтому замер
+# только читает данные, зафиксированные при засеве.
+pytestmark = [pytest.mark.django_db]
+
+django_db_setup = seeded_django_db_setup
+
+
+@pytest.fixture(scope="module")
+def sample(django_db_setup, django_db_blocker):
+    """Адреса лент и сессия автора, созданная вне транзакции теста.
+
+    Авторизованные запросы не попадают в кэш страниц для анонимов.
+    """
+    from blog.common import filter_objects_published
+    from blog.models import Post
+
+    with django_db_blocker.unblock():
+        post = filter_objects_published(
+            Post.objects.select_related("author", "category")
+        ).order_by("-comment_count").first()
+        client = Client()
+        client.force_login(post.author)
+    urls = {
+        "blog:index": "/",
+        "blog:post_detail": f"/posts/{post.id}/",
+        "blog:category_posts": f"/category/{post.category.slug}/",
+        "blog:profile": f"/profile/{post.author.username}/",
+    }
+    return urls, client.cookies
+
+
+def _stats(samples, elapsed):
+    return {
+        "rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+    }
+
+
+def _wsgi(url, cookies):
+    local = threading.local()
+
+    def get(_):
+        if not hasattr(local, "client"):
+            local.client = Client()
+            local.client.cookies = cookies
+        start = time.perf_counter()
+        response = local.client.get(url)
+        assert response.status_code == 200
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(BENCH_CONCURRENCY) as pool:
+        samples = list(pool.map(get, range(BENCH_REQUESTS)))
+    return _stats(samples, time.perf_counter() - start)
+
+
+def _asgi(url, cookies):
+    async def run():
+        client = AsyncClient()
+        client.cookies = cookies
+        semaphore = asyncio.Semaphore(BENCH_CONCURRENCY)
+
+        async def get():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url)
+                assert response.status_code == 200
+                return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(
+            *(get() for _ in range(BENCH_REQUESTS))
+        )
+        return _stats(samples, time.perf_counter() - start)
+
+    return async_to_sync(run)()
+
+
+def test_bench_async(settings, sample, async_urlconf):
+    urls, cookies = sample
+    modes = {
+        "wsgi-sync": (settings.ROOT_URLCONF, _wsgi),
+        "asgi-sync": (settings.ROOT_URLCONF, _asgi),
+        "asgi-async": (async_urlconf, _asgi),
+    }
+    results = []
+    for name, url in urls.items():
+        for mode, (urlconf, run) in modes.items():
+            settings.ROOT_URLCONF = urlconf
+            run(url, cookies)  # прогрев
+            row = {"name": name, "url": url, "client": mode}
+            row.update(run(url, cookies))
+            results.append(row)
+            print(
+                f"{name:<22} {mode:<11} {row['rps']:>8.1f} rps "
+                f"p50={row['p50_ms']:.2f} ms p99={row['p99_ms']:.2f} ms"
+            )
+
+    path = write_report("async", results, meta={
+        "users": BENCH_USERS,
+        "posts": BENCH_POSTS,
+        "comments": BENCH_COMMENTS,
+        "requests": BENCH_REQUESTS,
+        "concurrency": BENCH_CONCURRENCY,
+    })
+    print(f"Результаты сохранены в {path}")
@@ -0,0 +1,98 @@
+"""Способы получения числа комментариев для страницы ленты.
+
+Для каждой стратегии CommentCountMixin замеряется выборка страницы
+главной ленты: COUNT для пагинатора, десять публикаций со связанными
+объектами и число их комментариев. Сравниваются хранимый столбец,
+Count('comments') в запросе ленты (JOIN и GROUP BY по всем выбранным
+столбцам) и отдельный запрос post_id IN (...) по публикациям страницы.
+
+Запуск (размер данных задаётся BENCH_USERS, BENCH_POSTS, BENCH_COMMENTS):
+
+    pytest tests/benchmarks/bench_comment_counts.py
+
+Результаты пишутся в BENCH_OUTPUT_DIR/comment_counts-*.json.
+"""
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from bench_utils import (
+    BENCH_COMMENTS,
+    BENCH_POSTS,
+    BENCH_USERS,
+    measure,
+    seeded_django_db_setup,
+    write_report,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+django_db_setup = seeded_django_db_setup
+
+PAGES = (1, 50)
+
+
+def _load_page(strategy, number):
+    from blog.common import (
+        add_annotations_comments,
+        filter_objects_published,
+        get_objects_related,
+        set_comment_counts,
+    )
+    from blog.constants import (
+        COMMENT_COUNT_JOIN,
+        COMMENT_COUNT_STORED,
+        POSTS_PAGE_LIMIT,
+    )
+    from blog.models import Post
+
+    queryset = filter_objects_published(
+        get_objects_related(Post.objects)
+    ).order_by("-pub_date")
+    if strategy == COMMENT_COUNT_JOIN:
+        queryset = add_annotations_comments(queryset)
+    page = Paginator(queryset, POSTS_PAGE_LIMIT).page(number)
+    posts = list(page.object_list)
+    if strategy != COMMENT_COUNT_STORED:
+        set_comment_counts(posts, strategy)
+    return [post.comment_count for post in posts]
+
+
+def test_bench_comment_count_strategies():
+    from blog.constants import (
+        COMMENT_COUNT_IN_QUERY,
+        COMMENT_COUNT_JOIN,
+        COMMENT_COUNT_STORED,
+    )
+
+    strategies = (
+        COMMENT_COUNT_STORED, COMMENT_COUNT_JOIN, COMMENT_COUNT_IN_QUERY
+    )
+    results = []
+    for number in PAGES:
+        counts = {}
+        for strategy in strategies:
+            with CaptureQueriesContext(connection) as queries:
+                counts[strategy] = _load_page(strategy, number)
+            row = {
+                "name": f"index_page_{number}",
+                "client": strategy,
+                "queries": len(queries),
+            }
+            row.update(measure(lambda: _load_page(strategy, number)))
+            results.append(row)
+            print(
+                f"page {number:<4} {strategy:<9} "
+                f"p50={row['p50_ms']} ms p99={row['p99_ms']} ms "
+                f"queries={row['queries']}"
+            )
+        # Засев заполняет столбец точными значениями.
+        assert len({tuple(value) for value in counts.values()}) == 1
+
+    path = write_report("comment_counts", results, meta={
+        "users": BENCH_USERS,
+        "posts": BENCH_POSTS,
+        "comments": BENCH_COMMENTS,
+    })
+    print(f"Результаты сохранены в {path}")
@@ -0,0 +1,182 @@
+"""Конкурентная запись комментариев в SQLite для профилей базы.
+
+Для каждого профиля из DATABASE_PROFILES создаётся отдельный файл БД.
+Писатели, как запросы добавления комментария, вставляют комментарий
+и увеличивают счётчик в транзакции, а читатели в это время выбирают
+ленту. Соединения открываются и закрываются по CONN_MAX_AGE профиля.
+
+Запуск (BENCH_WRITERS, BENCH_READERS — число потоков, BENCH_WRITES —
+записей на писателя):
+
+    pytest tests/benchmarks/bench_sqlite.py
+
+Результаты пишутся в BENCH_OUTPUT_DIR/sqlite-*.json.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import OperationalError
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from bench_utils import percentile, write_report
+
+BENCH_WRITERS = int(os.getenv("BENCH_WRITERS", 8))
+BENCH_READERS = int(os.getenv("BENCH_READERS", 4))
+BENCH_WRITES = int(os.getenv("BENCH_WRITES", 200))
+POSTS = 100
+
+
+def _connection(path, profile):
+    return DatabaseWrapper({
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(path),
+        "TIME_ZONE": None,
+        "AUTOCOMMIT": True,
+        "ATOMIC_REQUESTS": False,
+        "CONN_MAX_AGE": profile["CONN_MAX_AGE"],
+        "OPTIONS": profile["OPTIONS"],
+    }, alias="bench")
+
+
+def _create_schema(path, profile):
+    connection = _connection(path, profile)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE post (id INTEGER PRIMARY KEY, "
+            "comment_count INTEGER NOT NULL DEFAULT 0)"
+        )
+        cursor.execute(
+            "CREATE TABLE comment (id INTEGER PRIMARY KEY, "
+            "post_id INTEGER NOT NULL, text TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        cursor.execute("CREATE INDEX comment_post_idx ON comment (post_id)")
+        cursor.executemany(
+            "INSERT INTO post (id) VALUES (%s)",
+            [(pk,) for pk in range(1, POSTS + 1)]
+        )
+    connection.close()
+
+
+def _request(connection, func):
+    """Обработка как у запроса: соединение по CONN_MAX_AGE."""
+    connection.close_if_unusable_or_obsolete()
+    try:
+        return func(connection)
+    finally:
+        connection.close_if_unusable_or_obsolete()
+
+
+def _write(connection, number):
+    post_id = number % POSTS + 1
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT id FROM post WHERE id = %s", [post_id])
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(
+                "INSERT INTO comment (post_id, text, created_at) "
+                "VALUES (%s, %s, %s)",
+                [post_id, "Комментарий", time.time()]
+            )
+            cursor.execute(
+                "UPDATE post SET comment_count = comment_count + 1 "
+                "WHERE id = %s",
+                [post_id]
+            )
+            cursor.execute("COMMIT")
+        except OperationalError:
+            cursor.execute("ROLLBACK")
+            raise
+
+
+def _read(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT post.id, post.comment_count, COUNT(comment.id) "
+            "FROM post LEFT JOIN comment ON comment.post_id = post.id "
+            "GROUP BY post.id ORDER BY post.comment_count DESC LIMIT 10"
+        )
+        cursor.fetchall()
+
+
+def _run_profile(path, profile):
+    _create_schema(path, profile)
+    stop = threading.Event()
+    reads = []
+
+    def reader():
+        connection = _connection(path, profile)
+        count = 0
+        while not stop.is_set():
+            try:
+                _request(connection, _read)
+                count += 1
+            except OperationalError:
+                pass
+        connection.close()
+        reads.append(count)
+
+    def writer(_):
+        connection = _connection(path, profile)
+        samples, errors = [], 0
+        for number in range(BENCH_WRITES):
+            start = time.perf_counter()
+            try:
+                _request(connection, lambda conn: _write(conn, number))
+            except OperationalError:
+                errors += 1
+                continue
+            samples.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        return samples, errors
+
+    readers = [threading.Thread(target=reader) for _ in range(BENCH_READERS)]
+    for thread in readers:
+        thread.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(BENCH_WRITERS) as pool:
+        outcomes = list(pool.map(writer, range(BENCH_WRITERS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    samples = [sample for result, _ in outcomes for sample in result]
+    return {
+        "writes_per_s": round(len(samples) / elapsed, 1),
+        "reads_per_s": round(sum(reads) / elapsed, 1),
+        "locked_errors": sum(errors for _, errors in outcomes),
+        "p50_ms": round(percentile(samples, 50), 3) if samples else None,
+        "p99_ms": round(percentile(samples, 99), 3) if samples else None,
+    }
+
+
+@pytest.fixture
+def file_db(django_db_blocker):
+    with django_db_blocker.unblock():
+        yield
+
+
+def test_bench_sqlite_profiles(settings, tmp_path, file_db):
+    results = []
+    for name, profile in settings.DATABASE_PROFILES.items():
+        settings.SQLITE_PRAGMAS = profile["PRAGMAS"]
+        row = {"name": "comment_writes", "client": name}
+        row.update(_run_profile(tmp_path / f"{name}.sqlite3", profile))
+        results.append(row)
+        print(
+            f"{name:<11} {row['writes_per_s']:>8.1f} writes/s "
+            f"{row['reads_per_s']:>9.1f} reads/s "
+            f"locked={row['locked_errors']} "
+            f"p50={row['p50_ms']} ms p99={row['p99_ms']} ms"
+        )
+
+    path = write_report("sqlite", results, meta={
+        "writers": BENCH_WRITERS,
+        "readers": BENCH_READERS,
+        "writes": BENCH_WRITES,
+    })
+    print(f"Результаты сохранены в {path}")
@@ -0,0 +1,96 @@
+"""Время рендеринга ленты с кэшированием шаблонов и без него.
+
+Страница blog/index.html с десятью карточками рендерится с движком
+без кэширующего загрузчика (каждый рендер заново читает и разбирает
+base.html, header.html, post_card.html и другие включения) и
+с профилем production из TEMPLATE_PROFILES, где все шаблоны разобраны
+заранее. Публикации загружаются один раз, кэш карточек очищается перед
+каждым рендером, поэтому замеряется только работа шаблонизатора.
+
+Запуск (BENCH_REPEAT — число рендеров):
+
+    pytest tests/benchmarks/bench_templates.py
+
+Результаты пишутся в BENCH_OUTPUT_DIR/templates-*.json.
+"""
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from bench_utils import BENCH_REPEAT, measure, write_report
+
+pytestmark = [pytest.mark.django_db]
+
+POSTS = 10
+
+
+def _templates(settings, name):
+    template = settings.TEMPLATES[0]
+    if name == "uncached":
+        return [{
+            **template,
+            "APP_DIRS": False,
+            "OPTIONS": {
+                **template["OPTIONS"],
+                "loaders": settings.TEMPLATE_LOADERS,
+            },
+        }]
+    profile = settings.TEMPLATE_PROFILES[name]
+    return [{
+        **template,
+        "APP_DIRS": profile["APP_DIRS"],
+        "OPTIONS": {**template["OPTIONS"], **profile["OPTIONS"]},
+    }]
+
+
+@pytest.fixture
+def context(mixer, published_category, published_location):
+    from blog.common import get_objects_related
+    from blog.models import Post
+
+    mixer.cycle(POSTS).blend(
+        "blog.Post",
+        category=published_category,
+        location=published_location,
+        is_published=True,
+    )
+    page = Paginator(
+        list(get_objects_related(Post.objects).order_by("-pub_date")), POSTS
+    ).page(1)
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    return {"page_obj": page, "paginator": page.paginator}, request
+
+
+def test_bench_template_profiles(settings, context):
+    from blog.constants import POST_CARD_CACHE_ALIAS
+    from blog.template_cache import precompile_templates
+
+    values, request = context
+    results = []
+    for name in ("uncached", "production"):
+        settings.TEMPLATES = _templates(settings, name)
+        if name == "production":
+            precompile_templates()
+
+        def render():
+            caches[POST_CARD_CACHE_ALIAS].clear()
+            return render_to_string("blog/index.html", values, request)
+
+        render()
+        row = {"name": "blog/index.html", "client": name}
+        row.update(measure(render))
+        results.append(row)
+        print(
+            f"{name:<11} p50={row['p50_ms']} ms p99={row['p99_ms']} ms "
+            f"mean={row['mean_ms']} ms"
+        )
+
+    path = write_report("templates", results, meta={
+        "posts": POSTS,
+        "repeat": BENCH_REPEAT,
+    })
+    print(f"Результаты сохранены в {path}")
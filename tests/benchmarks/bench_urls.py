@@ -0,0 +1,109 @@
+"""Замеры запросов к БД, задержки и объёма ответа для всех адресов.
+
+Запуск (размер данных задаётся BENCH_USERS, BENCH_POSTS, BENCH_COMMENTS):
+
+    pytest tests/benchmarks/bench_urls.py
+
+Результаты пишутся в BENCH_OUTPUT_DIR/urls-*.json.
+"""
+import pytest
+from django.db import connection, reset_queries
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from bench_utils import (
+    BENCH_COMMENTS,
+    BENCH_POSTS,
+    BENCH_REPEAT,
+    BENCH_USERS,
+    measure,
+    seeded_django_db_setup,
+    write_report,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+django_db_setup = seeded_django_db_setup
+
+
+def _url_patterns():
+    from blog import urls as blog_urls
+    from pages import urls as pages_urls
+
+    for module in (blog_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern):
+                yield f"{module.app_name}:{pattern.name}", pattern
+
+
+def _sample_kwargs():
+    """Опубликованная публикация с комментариями и комментарий её автора."""
+    from blog.common import filter_objects_published
+    from blog.models import Comment, Post
+
+    post = filter_objects_published(
+        Post.objects.select_related("author", "category")
+    ).filter(~Q(location=None)).order_by("-comment_count").first()
+    comment = Comment.objects.create(
+        post=post, author=post.author, text="Комментарий для замера"
+    )
+    values = {
+        "post_id": post.id,
+        "id": post.id,
+        "comment_id": comment.id,
+        "category_slug": post.category.slug,
+        "username": post.author.username,
+    }
+    return post.author, values
+
+
+def _measure_url(client, url):
+    # Журнал запросов ограничен 9000 записями и после засева уже полон.
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    # captured_queries читает живой журнал, который сбрасывает каждый запрос.
+    queries = len(ctx.captured_queries)
+    timings = measure(lambda: client.get(url))
+    return {
+        "status": response.status_code,
+        "queries": queries,
+        "bytes": len(response.content),
+        **timings,
+    }
+
+
+def test_bench_urls():
+    author, values = _sample_kwargs()
+    # Ошибки отображений попадают в отчёт как статус 500.
+    clients = {
+        "anonymous": Client(raise_request_exception=False),
+        "author": Client(raise_request_exception=False),
+    }
+    clients["author"].force_login(author)
+
+    results = []
+    for name, pattern in _url_patterns():
+        kwargs = {
+            key: values[key] for key in pattern.pattern.converters
+        }
+        url = reverse(name, kwargs=kwargs)
+        for client_name, client in clients.items():
+            row = {"name": name, "url": url, "client": client_name}
+            row.update(_measure_url(client, url))
+            results.append(row)
+            print(
+                f"{name:<28} {client_name:<10} {row['status']} "
+                f"q={row['queries']:<4} {row['bytes']:>8} B "
+                f"p50={row['p50_ms']:.2f} ms p99={row['p99_ms']:.2f} ms"
+            )
+
+    path = write_report("urls", results, meta={
+        "users": BENCH_USERS,
+        "posts": BENCH_POSTS,
+        "comments": BENCH_COMMENTS,
+        "repeat": BENCH_REPEAT,
+    })
+    print(f"Результаты сохранены в {path}")
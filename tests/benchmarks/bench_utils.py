@@ -0,0 +1,186 @@
+"""Общие помощники нагрузочных замеров: засев данных, статистика, отчёты."""
+import json
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+BENCH_USERS = int(os.getenv("BENCH_USERS", 10_000))
+BENCH_POSTS = int(os.getenv("BENCH_POSTS", 100_000))
+BENCH_COMMENTS = int(os.getenv("BENCH_COMMENTS", 1_000_000))
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", 50))
+BENCH_OUTPUT_DIR = Path(os.getenv("BENCH_OUTPUT_DIR", "bench_results"))
+BATCH_SIZE = 5000
+TEXT_POOL_SIZE = 500
+
+
+def _batched_create(model, rows, batch_size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed_dataset(
+        n_users: int = BENCH_USERS,
+        n_posts: int = BENCH_POSTS,
+        n_comments: int = BENCH_COMMENTS,
+        seed: int = 42,
+) -> None:
+    """Заполняет базу синтетическими данными через bulk_create.
+
+    Тексты берутся из пула, заранее созданного Faker из mixer, иначе
+    генерация миллиона комментариев занимает больше, чем сами замеры.
+    """
+    from blog.models import Category, Comment, Location, Post, make_excerpt
+
+    rnd = random.Random(seed)
+    faker = mixer.faker
+    faker.seed_instance(seed)
+    User = get_user_model()
+    sentences = [faker.sentence() for _ in range(TEXT_POOL_SIZE)]
+    paragraphs = [
+        "\n".join(faker.paragraphs(nb=rnd.randint(1, 8)))
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+    excerpts = {text: make_excerpt(text) for text in paragraphs}
+
+    def with_excerpt(post):
+        # bulk_create не вызывает save(), поэтому анонс задаётся явно.
+        post.excerpt = excerpts[post.text]
+        return post
+
+    _batched_create(User, (
+        User(username=f"bench_{i}", first_name=faker.first_name(),
+             last_name=faker.last_name(), password="!")
+        for i in range(n_users)
+    ))
+    mixer.cycle(20).blend("blog.Category", is_published=True)
+    mixer.cycle(50).blend("blog.Location", is_published=True)
+
+    user_ids = list(User.objects.values_list("id", flat=True))
+    category_ids = list(Category.objects.values_list("id", flat=True))
+    location_ids = list(Location.objects.values_list("id", flat=True))
+    now = timezone.now()
+
+    last_post_id = Post.objects.order_by("-id").values_list(
+        "id", flat=True).first() or 0
+    comment_counts = [0] * n_posts
+    for _ in range(n_comments):
+        comment_counts[rnd.randrange(n_posts)] += 1
+
+    _batched_create(Post, (
+        with_excerpt(Post(
+            title=rnd.choice(sentences)[:256],
+            text=rnd.choice(paragraphs),
+            # Небольшая доля публикаций отложена или снята.
+            pub_date=now - timedelta(minutes=rnd.randint(-10_000, 2_600_000)),
+            is_published=rnd.random() > 0.05,
+            author_id=rnd.choice(user_ids),
+            category_id=rnd.choice(category_ids),
+            location_id=rnd.choice(location_ids + [None]),
+            comment_count=comment_counts[i],
+        ))
+        for i in range(n_posts)
+    ))
+    post_ids = list(Post.objects.filter(id__gt=last_post_id).order_by(
+        "id").values_list("id", flat=True))
+    _batched_create(Comment, (
+        Comment(
+            text=rnd.choice(sentences),
+            author_id=rnd.choice(user_ids),
+            post_id=post_id,
+        )
+        for post_id, count in zip(post_ids, comment_counts)
+        for _ in range(count)
+    ))
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def measure(
+        func: Callable[[], object], repeat: int = BENCH_REPEAT
+) -> Dict[str, float]:
+    """Вызывает func repeat раз и возвращает статистику задержки в мс."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+    }
+
+
+def write_report(
+        name: str, results: list, meta: Optional[dict] = None
+) -> Path:
+    """Сохраняет результаты в JSON и печатает сравнение с прошлым запуском.
+
+    Рядом с файлом запуска обновляется <name>-latest.json; его удобно
+    сравнивать с очередным прогоном.
+    """
+    BENCH_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    latest = BENCH_OUTPUT_DIR / f"{name}-latest.json"
+    previous = json.loads(latest.read_text()) if latest.exists() else None
+    report = {
+        "meta": {
+            "timestamp": timezone.now().isoformat(),
+            "django": django.get_version(),
+            **(meta or {}),
+        },
+        "results": results,
+    }
+    stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    path = BENCH_OUTPUT_DIR / f"{name}-{stamp}.json"
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    path.write_text(payload)
+    latest.write_text(payload)
+    if previous is not None:
+        print_comparison(previous["results"], results)
+    return path
+
+
+def print_comparison(previous: list, current: list) -> None:
+    def key(row):
+        return row.get("name"), row.get("client")
+
+    before = {key(row): row for row in previous}
+    for row in current:
+        old = before.get(key(row))
+        if old is None or "p50_ms" not in old:
+            continue
+        print(
+            f"{row['name']:<28} {row.get('client', ''):<10} "
+            f"p50 {old['p50_ms']:>9.2f} -> {row['p50_ms']:>9.2f} ms  "
+            f"queries {old.get('queries', '-')} -> {row.get('queries', '-')}"
+        )
+
+
+@pytest.fixture(scope="session")
+def seeded_django_db_setup(django_db_setup, django_db_blocker):
+    """Засевает тестовую базу один раз за сессию замеров.
+
+    Модуль замеров подключает фикстуру под именем django_db_setup.
+    """
+    with django_db_blocker.unblock():
+        seed_dataset()
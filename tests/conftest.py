@@ -1,6 +1,9 @@
+import importlib.util
 import os
 import re
+import tempfile
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -19,11 +22,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -35,12 +40,63 @@ UrlRepr = NamedTuple("UrlRepr", [("url", str), ("repr", str)])
 TitledUrlRepr = TypeVar("TitledUrlRepr", bound=Tuple[UrlRepr, str])
 
 
+def pytest_configure(config):
+    """Реплика для чтения — отдельный файл SQLite, а не зеркало основной БД.
+
+    Тесты, которым она нужна, подключают её через
+    django_db(databases=["default", "replica"]).
+    """
+    from django.conf import settings
+
+    path = Path(tempfile.gettempdir()) / f"blogicum-replica-{os.getpid()}"
+    settings.DATABASES["replica"] = {
+        **settings.DATABASES["default"],
+        "NAME": f"{path}.sqlite3",
+        "TEST": {"NAME": f"{path}-test.sqlite3"},
+    }
+
+
 @pytest.fixture(autouse=True)
 def enable_debug_false():
     with override_settings(DEBUG=False):
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def bypass_feed_page_cache(request, monkeypatch):
+    """Анонимные запросы к лентам идут мимо кэша страниц.
+
+    Тесты самого кэша помечаются маркером feed_page_cache.
+    """
+    if request.node.get_closest_marker("feed_page_cache") is None:
+        from blog.cache import FeedPageCache
+
+        monkeypatch.setattr(
+            FeedPageCache, "is_cacheable", lambda self, request: False
+        )
+
+
+@pytest.fixture
+def async_urlconf(settings):
+    """Корневой URLconf, собранный с ASYNC_VIEWS=1.
+
+    Модуль blogicum.urls выбирает представления блога при импорте,
+    поэтому для асинхронных представлений исполняется его отдельная копия.
+    """
+    settings.ASYNC_VIEWS = True
+    spec = importlib.util.find_spec("blogicum.urls")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -114,6 +170,18 @@ def another_user(mixer):
     return mixer.blend(User)
 
 
+@pytest.fixture
+def post(mixer, user, published_category):
+    """Опубликованный вчера пост: виден во всех лентах."""
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
 @pytest.fixture
 def user_client(user):
     client = Client()
@@ -363,6 +431,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
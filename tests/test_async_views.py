@@ -0,0 +1,64 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+# Запросы асинхронных представлений идут в других потоках и видят только
+# зафиксированные данные.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture(autouse=True)
+def async_urls(settings, async_urlconf):
+    settings.ROOT_URLCONF = async_urlconf
+    # Фоновая обработка изображений сдвигает версии лент между запросами.
+    settings.TASK_QUEUE_WORKERS = 0
+
+
+def _urls(post):
+    return {
+        "detail": f"/posts/{post.id}/",
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }
+
+
+@pytest.mark.parametrize("page", ["detail", "index", "category", "profile"])
+def test_async_pages_render_post(client, post, page):
+    response = client.get(_urls(post)[page])
+    assert response.status_code == 200
+    assert post.title in response.content.decode("utf-8")
+
+    response = client.get(
+        _urls(post)[page], HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+
+
+def test_async_client_gets_category(post):
+    response = async_to_sync(AsyncClient().get)(_urls(post)["category"])
+    assert response.status_code == 200
+    assert post.category.title in response.content.decode("utf-8")
+
+
+def test_unpublished_category_is_404(client, post):
+    post.category.is_published = False
+    post.category.save()
+    response = client.get(_urls(post)["category"])
+    assert response.status_code == 404
+
+
+def test_hidden_post_is_404(client, post):
+    post.is_published = False
+    post.save()
+    assert client.get(_urls(post)["detail"]).status_code == 404
+    assert client.get("/?page=2").status_code == 404
+
+
+def test_async_feed_uses_feed_pagination(client, post):
+    from blog.counts import CachedCountPaginator
+
+    response = client.get(_urls(post)["category"])
+    paginator = response.context["paginator"]
+    assert isinstance(paginator, CachedCountPaginator)
+    assert paginator.count_scope == f"category:{post.category.slug}"
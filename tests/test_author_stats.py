@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import AuthorStats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stats(user):
+    stats = AuthorStats.objects.get(user=user)
+    return (
+        stats.posts_count, stats.is_published_posts_count, stats.comments_count
+    )
+
+
+def test_post_create_toggle_and_delete(mixer, user, post):
+    assert _stats(user) == (1, 1, 0)
+
+    post.is_published = False
+    post.save()
+    assert _stats(user) == (1, 0, 0)
+
+    mixer.blend("blog.Post", author=user, is_published=True)
+    assert _stats(user) == (2, 1, 0)
+
+    post.delete()
+    assert _stats(user) == (1, 1, 0)
+
+
+def test_post_reassigned_to_another_author(user, another_user, post):
+    post.author = another_user
+    post.save()
+    assert _stats(user) == (0, 0, 0)
+    assert _stats(another_user) == (1, 1, 0)
+
+
+def test_comments_follow_views(
+        settings, user_client, another_user_client, another_user, user, post,
+        django_capture_on_commit_callbacks
+):
+    from blog.queue import task_queue
+
+    settings.TASK_QUEUE_WORKERS = 0
+    another_user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+    )
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Ответ"})
+    assert _stats(another_user) == (0, 0, 1)
+    assert _stats(user) == (1, 1, 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{post.id}/delete/")
+    # Комментарии удалённой публикации удаляет фоновая задача.
+    assert _stats(another_user) == (0, 0, 1)
+    task_queue.work(burst=True)
+    assert _stats(another_user) == (0, 0, 0)
+    assert _stats(user) == (0, 0, 0)
+
+
+def test_comment_signals_do_not_load_author(mixer, user, post):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from blog.models import Comment
+
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    with CaptureQueriesContext(connection) as queries:
+        for comment in Comment.objects.filter(post=post):
+            comment.delete()
+    assert not any(
+        query["sql"].startswith('SELECT "auth_user"') for query in queries
+    )
+    assert _stats(user) == (1, 1, 0)
+
+
+def test_profile_shows_stats(
+        client, mixer, user, post
+):
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    url = f"/profile/{user.username}/"
+    response = client.get(url)
+    content = response.content.decode("utf-8")
+    assert "Публикаций: 1" in content
+    assert "Комментариев: 3" in content
+
+
+def test_rebuild_command_fixes_drift(user, post):
+    AuthorStats.objects.filter(user=user).update(posts_count=42)
+    out = StringIO()
+    call_command("rebuild_author_stats", stdout=out)
+    assert _stats(user) == (1, 1, 0)
+    assert "Пересчитано авторов" in out.getvalue()
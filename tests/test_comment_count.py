@@ -0,0 +1,82 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.constants import COMMENT_COUNT_IN_QUERY, COMMENT_COUNT_JOIN
+from blog.models import Comment, Post
+from blog.views import IndexView
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_create_and_delete(user_client, post):
+    for i in range(2):
+        user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": f"Комментарий {i}"}
+        )
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+def test_comment_count_follows_commenter_deletion(
+        mixer, user, another_user, post
+):
+    mixer.cycle(2).blend("blog.Comment", post=post, author=another_user)
+    mixer.blend("blog.Comment", post=post, author=user)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+    another_user.delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+    Comment.objects.filter(post=post).delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0
+
+
+def test_feed_reads_stored_count(client, post):
+    Post.objects.filter(pk=post.pk).update(comment_count=7)
+    response = client.get("/")
+    assert "Комментарии (7)" in response.content.decode("utf-8")
+
+
+def test_reconcile_command_fixes_drift(mixer, user, post):
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    out = StringIO()
+    call_command("reconcile_comment_counts", stdout=out)
+
+    post.refresh_from_db()
+    assert post.comment_count == 3
+    assert "Исправлено публикаций: 1" in out.getvalue()
+
+
+@pytest.mark.parametrize(
+    "strategy", [COMMENT_COUNT_JOIN, COMMENT_COUNT_IN_QUERY]
+)
+def test_feed_counts_comments_with_strategy(
+        monkeypatch, client, mixer, user, post, strategy
+):
+    monkeypatch.setattr(IndexView, "comment_count_strategy", strategy)
+    mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    Post.objects.filter(pk=post.pk).update(comment_count=7)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert "Комментарии (2)" in response.content.decode("utf-8")
+    grouped = [q["sql"] for q in queries if "GROUP BY" in q["sql"]]
+    if strategy == COMMENT_COUNT_JOIN:
+        assert any('"blog_comment"' in sql for sql in grouped)
+    else:
+        assert len(grouped) == 1
+        assert '"blog_comment"."post_id" IN' in grouped[0]
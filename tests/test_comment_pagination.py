@@ -0,0 +1,42 @@
+import re
+
+import pytest
+
+from blog.constants import COMMENTS_PAGE_LIMIT
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def comments(mixer, user, post):
+    return mixer.cycle(COMMENTS_PAGE_LIMIT + 10).blend(
+        "blog.Comment", post=post, author=user
+    )
+
+
+def _comment_ids(content):
+    return [int(i) for i in re.findall(r'name="comment_(\d+)"', content)]
+
+
+def test_detail_renders_first_batch(user_client, post, comments):
+    response = user_client.get(f"/posts/{post.id}/")
+    content = response.content.decode("utf-8")
+    expected = [comment.id for comment in comments]
+    assert _comment_ids(content) == expected[:COMMENTS_PAGE_LIMIT]
+
+    more_url = re.search(r'href="([^"]+)" data-comments-more', content)[1]
+    fragment = user_client.get(more_url.replace("&amp;", "&"))
+    assert fragment.status_code == 200
+    content = fragment.content.decode("utf-8")
+    assert _comment_ids(content) == expected[COMMENTS_PAGE_LIMIT:]
+    assert "data-comments-more" not in content
+    assert "<html" not in content
+
+
+def test_fragment_hides_unpublished_post(
+        another_user_client, post, comments
+):
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
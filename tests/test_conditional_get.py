@@ -0,0 +1,52 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("page", ["detail", "index", "category", "profile"])
+def test_repeat_request_gets_304(user_client, post, page):
+    url = {
+        "detail": f"/posts/{post.id}/",
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[page]
+    response = user_client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response.has_header("Last-Modified")
+
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not response.content
+
+
+def test_comment_changes_detail_etag(user_client, post):
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_etag_differs_per_user(user_client, another_user_client, post):
+    url = f"/posts/{post.id}/"
+    etag = user_client.get(url)["ETag"]
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_view_without_validators_is_served_as_usual(rf):
+    from django.http import HttpResponse
+    from django.views import View
+
+    from blog.mixins import ConditionalGetMixin
+
+    class PlainView(ConditionalGetMixin, View):
+        def get(self, request):
+            return HttpResponse("ok")
+
+    response = PlainView.as_view()(rf.get("/"))
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
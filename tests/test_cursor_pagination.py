@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    base = timezone.now() - timedelta(days=1)
+    # Две публикации с одинаковым pub_date проверяют разрешение по id.
+    dates = [
+        base - timedelta(minutes=i // 2) for i in range(N_PER_PAGE * 2 + 5)
+    ]
+    return mixer.cycle(len(dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(d for d in dates),
+    )
+
+
+def _ids(response):
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_cursor_walks_feed_without_gaps(client, many_posts):
+    expected = [
+        post.id for post in sorted(
+            many_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+        )
+    ]
+    seen = []
+    url = "/?cursor="
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.context["page_obj"]
+        seen.extend(_ids(response))
+        url = f"/?cursor={page.next_cursor}" if page.has_next() else None
+    assert seen == expected
+
+    first_page = client.get("/?cursor=").context["page_obj"]
+    second = client.get(f"/?cursor={first_page.next_cursor}")
+    back = client.get(
+        f"/?cursor={second.context['page_obj'].previous_cursor}"
+    )
+    assert _ids(back) == expected[:N_PER_PAGE]
+    assert not back.context["page_obj"].has_previous()
+
+
+def test_cursor_page_skips_count(client, many_posts):
+    first_page = client.get("/?cursor=").context["page_obj"]
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(f"/?cursor={first_page.next_cursor}")
+    assert not any("COUNT(*)" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_invalid_cursor_is_404(client, many_posts):
+    assert client.get("/?cursor=not-a-cursor").status_code == 404
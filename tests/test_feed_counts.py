@@ -0,0 +1,132 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.counts import CachedCountPaginator, feed_count_cache
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(12).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+    )
+
+
+def _count(client, url):
+    """Число публикаций ленты и был ли выполнен COUNT(*)."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    counted = any("COUNT(" in query["sql"] for query in queries)
+    return response.context["paginator"].count, counted
+
+
+def test_count_is_cached_per_feed(another_user_client, posts, user):
+    for url in ("/", f"/category/{posts[0].category.slug}/",
+                f"/profile/{user.username}/"):
+        assert _count(another_user_client, url) == (12, True)
+        assert _count(another_user_client, url) == (12, False)
+
+
+def test_count_follows_post_changes(
+        mixer, another_user_client, user_client, posts, user
+):
+    profile = f"/profile/{user.username}/"
+    _count(another_user_client, "/")
+    _count(another_user_client, profile)
+    _count(user_client, profile)
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=posts[0].category,
+        is_published=True,
+    )
+    assert _count(another_user_client, "/") == (13, False)
+
+    post.is_published = False
+    post.save()
+    assert _count(another_user_client, "/") == (12, False)
+    assert _count(another_user_client, profile) == (12, False)
+    # Автор видит и снятую с публикации.
+    assert _count(user_client, profile) == (13, False)
+
+    posts[0].delete()
+    assert _count(another_user_client, "/") == (11, False)
+    assert _count(user_client, profile) == (12, False)
+
+
+def test_category_change_resets_counts(another_user_client, posts):
+    _count(another_user_client, "/")
+    category = posts[0].category
+    category.is_published = False
+    category.save()
+    assert _count(another_user_client, "/") == (0, True)
+
+
+def test_large_feed_uses_estimate(posts):
+    paginator = CachedCountPaginator(
+        Post.objects.order_by("-pub_date"), 5,
+        count_scope="index", count_threshold=5, estimate_sample=6,
+    )
+    assert paginator.count >= 12
+    assert paginator.estimated
+    last = paginator.page(3)
+    assert not last.has_next()
+    assert paginator.count == 12
+
+    # Уточнённое число сохраняется в кэше вместо оценки.
+    assert feed_count_cache.get(paginator.count_key) == 12
+
+
+def test_registrations_do_not_overwrite_each_other(posts):
+    published = Post.objects.filter(is_published=True)
+    feeds = [published, published.filter(author=posts[0].author)]
+    keys = [feed_count_cache.get_key(feed) for feed in feeds]
+    for key, feed in zip(keys, feeds):
+        feed_count_cache.set(key, feed.count(), feed, "index")
+    # Повторная регистрация не занимает новый слот.
+    feed_count_cache.set(keys[0], 12, feeds[0], "index")
+
+    assert set(feed_count_cache.get_registry("index")) == set(keys)
+    assert feed_count_cache.get_membership(
+        Post, posts[0].pk, feed_count_cache.get_queries(["index"])
+    ) == set(keys)
+
+
+def test_author_rename_resets_profile_count(
+        mixer, another_user_client, posts, user
+):
+    assert _count(another_user_client, f"/profile/{user.username}/") == (
+        12, True
+    )
+    user.username = "renamed"
+    user.save()
+    mixer.blend(
+        "blog.Post", author=user, category=posts[0].category,
+        is_published=True,
+    )
+    assert _count(another_user_client, "/profile/renamed/") == (13, True)
+
+
+def test_unfiltered_field_change_skips_membership_check(
+        monkeypatch, another_user_client, posts
+):
+    _count(another_user_client, "/")
+    scopes = []
+    monkeypatch.setattr(
+        feed_count_cache, "get_registry",
+        lambda scope: scopes.append(scope) or {},
+    )
+    post = Post.objects.get(pk=posts[0].pk)
+    post.title = "Новый заголовок"
+    post.save()
+    Post.objects.only("title").get(pk=posts[1].pk).save()
+    assert scopes == []
+
+    post.is_published = False
+    post.save()
+    assert "index" in scopes
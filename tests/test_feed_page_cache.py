@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import FeedPageCache
+from blog.common import get_publication_boundary
+
+pytestmark = [pytest.mark.django_db, pytest.mark.feed_page_cache]
+
+
+def test_anonymous_feed_served_from_cache(
+        client, post, django_assert_num_queries
+):
+    first = client.get("/")
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content
+
+
+def test_authenticated_feed_not_cached(user_client, post):
+    user_client.get("/")
+    assert user_client.get("/").context is not None
+
+
+def test_comment_invalidates_feeds(client, user_client, post):
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        client.get(url)
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    for url in urls:
+        content = client.get(url).content.decode("utf-8")
+        assert "Комментарии (1)" in content, url
+
+
+def test_scheduled_post_expires_page_at_publication(mixer, post):
+    boundary = get_publication_boundary()
+    mixer.blend(
+        "blog.Post",
+        category=post.category,
+        is_published=True,
+        pub_date=boundary + timedelta(hours=2),
+    )
+    expected = (boundary - timezone.now()).total_seconds()
+    timeout = FeedPageCache(timeout=10 ** 9).get_timeout()
+    assert abs(timeout - expected) <= 2
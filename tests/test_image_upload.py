@@ -0,0 +1,138 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog import constants, images, uploads
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def _image_file(size, image_format="PNG", name="image.png"):
+    buffer = BytesIO()
+    Image.new("RGB", size, "blue").save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def _create(client, category, image):
+    return client.post(
+        "/posts/create/",
+        data={
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2020-01-01T10:00",
+            "category": category.id,
+            "image": image,
+        },
+    )
+
+
+def test_rejects_too_many_pixels_from_header(
+        monkeypatch, user_client, published_category
+):
+    monkeypatch.setattr(uploads, "IMAGE_UPLOAD_MAX_PIXELS", 100 * 100)
+    response = _create(
+        user_client, published_category, _image_file((200, 200))
+    )
+    assert "Изображение слишком большое" in response.content.decode("utf-8")
+    assert not Post.objects.exists()
+
+
+def test_rejects_oversize_file(monkeypatch, user_client, published_category):
+    monkeypatch.setattr(uploads, "IMAGE_UPLOAD_MAX_SIZE", 1024)
+    image = SimpleUploadedFile(
+        "image.bmp", _image_file((200, 200), "BMP").read()
+    )
+    response = _create(user_client, published_category, image)
+    assert "Размер файла не должен превышать" in response.content.decode(
+        "utf-8"
+    )
+    assert not Post.objects.exists()
+
+
+def test_rejects_unsupported_format(user_client, published_category):
+    response = _create(
+        user_client,
+        published_category,
+        SimpleUploadedFile("image.bmp", _image_file((10, 10), "BMP").read()),
+    )
+    assert "Допустимые форматы" in response.content.decode("utf-8")
+    assert not Post.objects.exists()
+
+
+def test_large_image_is_reencoded_within_bounds(
+        user_client, published_category
+):
+    limit = constants.IMAGE_MAX_DIMENSION
+    _create(
+        user_client,
+        published_category,
+        _image_file((limit * 2, limit), "JPEG", "image.jpg"),
+    )
+    post = Post.objects.get()
+    with post.image.open() as file:
+        image = Image.open(file)
+        assert image.format == "JPEG"
+        assert image.size == (limit, limit // 2)
+
+
+def _animated_gif(size, frames=3):
+    buffer = BytesIO()
+    images = [
+        Image.new("RGB", size, color) for color in ("red", "green", "blue")
+    ][:frames]
+    images[0].save(
+        buffer, "GIF", save_all=True, append_images=images[1:],
+        duration=100, loop=0
+    )
+    return SimpleUploadedFile("image.gif", buffer.getvalue())
+
+
+def test_admin_shows_rejected_image(admin_client, user, published_category):
+    response = admin_client.post(
+        "/admin/blog/post/add/",
+        data={
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date_0": "2020-01-01",
+            "pub_date_1": "10:00",
+            "author": user.id,
+            "category": published_category.id,
+            "is_published": "on",
+            "image": SimpleUploadedFile(
+                "image.bmp", _image_file((10, 10), "BMP").read()
+            ),
+        },
+    )
+    assert response.status_code == 200
+    assert "Допустимые форматы" in response.content.decode("utf-8")
+    assert not Post.objects.exists()
+
+
+def test_animated_gif_keeps_frames(user_client, published_category):
+    limit = constants.IMAGE_MAX_DIMENSION
+    _create(user_client, published_category, _animated_gif((limit * 2, 10)))
+    post = Post.objects.get()
+    with post.image.open() as file:
+        image = Image.open(file)
+        assert image.format == "GIF"
+        assert image.n_frames == 3
+        assert image.size == (limit, 5)
+
+
+def test_rejects_oversized_animation(
+        monkeypatch, user_client, published_category
+):
+    monkeypatch.setattr(images, "IMAGE_UPLOAD_MAX_PIXELS", 100 * 100)
+    response = _create(
+        user_client, published_category, _animated_gif((80, 80))
+    )
+    assert "Анимация слишком большая" in response.content.decode("utf-8")
+    assert not Post.objects.exists()
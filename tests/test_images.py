@@ -0,0 +1,123 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog import images
+from blog.models import Post
+from blog.queue import task_queue
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def _image_file(name="photo.jpg", size=(2000, 1000), image_format="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def test_generate_derivatives_resizes_and_encodes_webp():
+    name = default_storage.save("posts_img/photo.jpg", _image_file())
+
+    images.generate_derivatives(name)
+
+    for variant, (fallback, webp) in images.get_derivative_names(
+        name
+    ).items():
+        width = images.IMAGE_VARIANTS[variant]
+        with default_storage.open(fallback) as file:
+            assert Image.open(file).size == (width, width // 2)
+        with default_storage.open(webp) as file:
+            assert Image.open(file).format == "WEBP"
+    assert images.derivatives_exist(name)
+
+
+def test_post_save_schedules_derivatives(
+        settings, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    settings.TASK_QUEUE_WORKERS = 0
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            image=_image_file(),
+        )
+    task_queue.work(burst=True)
+    assert images.derivatives_exist(post.image.name)
+
+
+def test_detail_page_uses_srcset(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        image=_image_file(),
+    )
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert "srcset" not in content
+    assert post.image.url in content
+
+    images.generate_derivatives(post.image.name)
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert 'type="image/webp"' in content
+    assert "_detail.jpg" in content
+    assert content.count("img-thumbnail") == 1
+
+
+def test_derivative_names_keep_original_extension():
+    jpg = images.get_derivative_names("posts_img/photo.jpg")
+    png = images.get_derivative_names("posts_img/photo.png")
+    assert not set(jpg["feed"]) & set(png["feed"])
+
+
+def test_resave_without_image_change_skips_storage(
+        monkeypatch, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=_image_file(),
+    )
+    checked = []
+    monkeypatch.setattr(
+        "blog.signals.derivatives_exist", lambda name: checked.append(name)
+    )
+    post.title = "Новый заголовок"
+    post.save()
+    Post.objects.get(pk=post.pk).save()
+    assert checked == []
+
+
+def test_animated_derivatives_keep_frames():
+    buffer = BytesIO()
+    frames = [
+        Image.new("RGB", (1600, 800), color) for color in ("red", "blue")
+    ]
+    frames[0].save(buffer, "GIF", save_all=True, append_images=frames[1:])
+    name = default_storage.save(
+        "posts_img/anim.gif", SimpleUploadedFile("anim.gif", buffer.getvalue())
+    )
+
+    images.generate_derivatives(name)
+
+    fallback, webp = images.get_derivative_names(name)["feed"]
+    for derivative in (fallback, webp):
+        with default_storage.open(derivative) as file:
+            image = Image.open(file)
+            assert image.n_frames == 2
+            assert image.size == (640, 320)
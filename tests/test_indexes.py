@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+from blog.common import filter_objects_published
+from blog.models import Comment, Post
+from blog.views import IndexView
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="План запроса проверяется в формате SQLite.",
+    ),
+]
+
+
+def _assert_plan(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}"
+    )
+    assert "TEMP B-TREE FOR ORDER BY" not in plan, (
+        f"Убедитесь, что запрос не сортирует строки отдельно:\n{plan}"
+    )
+
+
+def test_index_feed_uses_index():
+    _assert_plan(IndexView().get_queryset(), "post_published_partial_idx")
+
+
+def test_category_feed_uses_index(published_category):
+    _assert_plan(
+        filter_objects_published(published_category.posts).order_by(
+            "-pub_date"
+        ),
+        "post_category_pub_date_idx",
+    )
+
+
+def test_profile_feed_uses_index(user):
+    _assert_plan(
+        Post.objects.filter(author=user).order_by("-pub_date"),
+        "post_author_pub_date_idx",
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    _assert_plan(
+        Comment.objects.filter(post=post_with_published_location).order_by(
+            "created_at"
+        ),
+        "comment_post_created_at_idx",
+    )
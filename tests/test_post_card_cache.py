@@ -0,0 +1,54 @@
+import pytest
+
+from blog.cache import post_card_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        title="Исходный заголовок",
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    post_card_cache.reset_stats()
+
+
+def test_second_render_is_a_hit(client, post):
+    client.get("/")
+    assert post_card_cache.stats() == {"hits": 0, "misses": 1}
+    client.get("/")
+    assert post_card_cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_post_edit_invalidates_card(client, post):
+    client.get("/")
+    post.title = "Новый заголовок"
+    post.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "Новый заголовок" in content
+    assert post_card_cache.stats()["misses"] == 2
+
+
+def test_comment_invalidates_card(user_client, post):
+    user_client.get("/")
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    content = user_client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content
+
+
+def test_location_toggle_invalidates_card(client, post, published_location):
+    content = client.get("/").content.decode("utf-8")
+    assert published_location.name in content
+    published_location.is_published = False
+    published_location.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "Планета Земля" in content
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(500))
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        text=LONG_TEXT,
+    )
+
+
+def test_excerpt_follows_text(post):
+    expected = " ".join(f"слово{i}" for i in range(10)) + " …"
+    assert post.excerpt == expected
+
+    post.text = "Новый короткий текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Новый короткий текст"
+
+
+def test_feed_does_not_load_full_text(user_client, post):
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/")
+    content = response.content.decode("utf-8")
+    assert post.excerpt in content
+    assert "слово11" not in content
+    feed_queries = [
+        query["sql"] for query in queries
+        if 'FROM "blog_post"' in query["sql"]
+        and '"blog_post"."title"' in query["sql"]
+    ]
+    assert feed_queries
+    for sql in feed_queries:
+        assert '"blog_post"."text"' not in sql
+        assert '"blog_category"."description"' not in sql
+        assert '"auth_user"."password"' not in sql
+
+
+def test_detail_shows_full_text(user_client, post):
+    response = user_client.get(f"/posts/{post.id}/")
+    assert "слово499" in response.content.decode("utf-8")
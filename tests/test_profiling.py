@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from blog import profiling
+from blog.management.commands.profile_report import summarize
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def profiling_log(settings, tmp_path):
+    settings.PROFILING = True
+    settings.PROFILING_SAMPLE_RATE = 1
+    settings.PROFILING_LOG = tmp_path / "profiling.log"
+    profiling.profiles.clear()
+    yield settings.PROFILING_LOG
+    profiling.profiles.clear()
+
+
+def test_middleware_records_request(profiling_log, post_with_published_location):
+    response = Client().get("/")
+    profile = profiling.profiles[-1]
+    assert profile["view"] == "blog:index"
+    assert profile["status"] == 200
+    assert profile["queries"] > 0
+    assert profile["render"] > 0
+    assert profile["size"] == len(response.content)
+    assert "blog:index" in profiling_log.read_text(encoding="utf-8")
+
+
+def test_function_view_render_is_measured(
+        profiling_log, mixer, user, user_client, post_with_published_location
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    user_client.get(
+        f"/posts/{comment.post_id}/delete_comment/{comment.id}/"
+    )
+    profile = profiling.profiles[-1]
+    assert profile["view"] == "blog:delete_comment"
+    assert profile["render"] > 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_view_queries_are_recorded(
+        profiling_log, settings, async_urlconf, post_with_published_location
+):
+    settings.ROOT_URLCONF = async_urlconf
+    settings.TASK_QUEUE_WORKERS = 0
+    Client().get("/")
+    profile = profiling.profiles[-1]
+    assert profile["view"] == "blog:index"
+    # Счётчик и страница ленты читаются в потоках sync_to_async.
+    assert profile["queries"] >= 2
+    assert profile["render"] > 0
+
+
+def test_middleware_is_disabled_by_default(settings):
+    settings.PROFILING = False
+    profiling.profiles.clear()
+    Client().get("/")
+    assert not profiling.profiles
+
+
+def test_recorder_detects_repeated_queries():
+    recorder = profiling.QueryRecorder()
+    recorder.queries = [
+        ("SELECT * FROM blog_post WHERE id = %s", "(1,)", 0.001),
+        ("SELECT * FROM blog_post WHERE id = %s", "(1,)", 0.001),
+        ("SELECT * FROM blog_post WHERE id = %s", "(2,)", 0.001),
+        ("SELECT COUNT(*) FROM blog_post", "()", 0.001),
+    ]
+    assert recorder.get_duplicates() == {
+        "duplicates": 1,
+        "similar": 3,
+        "similar_sql": "SELECT * FROM blog_post WHERE id = %s",
+    }
+
+
+def test_report_lists_slow_views_and_offenders(profiling_log):
+    client = Client()
+    client.get("/")
+    client.get("/category/missing/")
+    out = StringIO()
+    call_command("profile_report", log=profiling_log, stdout=out)
+    output = out.getvalue()
+    assert "Самые медленные представления" in output
+    assert "blog:index" in output
+    assert "blog:category_posts" in output
+
+    summary = summarize([
+        {"view": "v", "duration": 0.1, "queries": 12, "sql_time": 0.05,
+         "render": 0.01, "size": 100, "duplicates": 0, "similar": 10,
+         "similar_sql": "SELECT ?"},
+    ])
+    assert summary[0]["similar"] == 10
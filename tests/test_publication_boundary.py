@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.utils import timezone
+
+from blog import common
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+MOSCOW = pytz.timezone("Europe/Moscow")
+
+
+@pytest.mark.parametrize(
+    "utc_now",
+    [
+        # 23:59 по Москве, в UTC ещё тот же день.
+        datetime(2024, 3, 10, 20, 59, tzinfo=pytz.UTC),
+        # 00:30 по Москве, в UTC ещё предыдущий день.
+        datetime(2024, 3, 10, 21, 30, tzinfo=pytz.UTC),
+        # Полночь по Москве ровно.
+        datetime(2024, 3, 10, 21, 0, tzinfo=pytz.UTC),
+        datetime(2024, 12, 31, 22, 0, tzinfo=pytz.UTC),
+    ],
+)
+def test_boundary_matches_date_cast(
+        monkeypatch, mixer, user, published_category, utc_now
+):
+    monkeypatch.setattr(common, "now", lambda: utc_now)
+    local_today = utc_now.astimezone(MOSCOW).date()
+    local_midnight = MOSCOW.localize(
+        datetime.combine(local_today, datetime.min.time())
+    )
+    pub_dates = [
+        local_midnight + timedelta(days=days, seconds=seconds)
+        for days in (-1, 0, 1, 2)
+        for seconds in (-1, 0, 1)
+    ]
+    mixer.cycle(len(pub_dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(d for d in pub_dates),
+    )
+
+    with timezone.override(MOSCOW):
+        expected = set(
+            Post.objects.filter(
+                pub_date__date__lte=utc_now
+            ).values_list("id", flat=True)
+        )
+        actual = set(
+            common.filter_objects_published(Post.objects).values_list(
+                "id", flat=True
+            )
+        )
+    assert actual == expected
+    assert common.get_publication_boundary() == (
+        local_midnight + timedelta(days=1)
+    )
+
+
+def test_filter_does_not_cast_pub_date():
+    sql = str(common.filter_objects_published(Post.objects).query)
+    assert "django_datetime_cast_date" not in sql
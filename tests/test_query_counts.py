@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _post_selects(ctx):
+    return [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize(
+    ("action", "expected_queries"),
+    [
+        # Сессия, пользователь, публикация и списки выбора формы.
+        ("edit", 5),
+        # Сессия, пользователь и публикация.
+        ("delete", 3),
+    ],
+)
+def test_get_loads_post_once(
+        user_client, post, django_assert_num_queries, action,
+        expected_queries
+):
+    with django_assert_num_queries(expected_queries):
+        response = user_client.get(f"/posts/{post.id}/{action}/")
+    assert response.status_code == 200
+
+
+def test_edit_post_loads_post_once(user_client, post):
+    data = {
+        "title": "Новый заголовок",
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+        "category": post.category_id,
+        "is_published": True,
+    }
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(f"/posts/{post.id}/edit/", data=data)
+    assert response.status_code == 302
+    assert len(_post_selects(ctx)) == 1
+
+
+def test_delete_post_loads_post_once(user_client, post):
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302
+    assert len(_post_selects(ctx)) == 1
+
+
+def test_other_user_is_redirected(another_user_client, post):
+    response = another_user_client.get(f"/posts/{post.id}/edit/")
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
@@ -0,0 +1,129 @@
+import pytest
+from django.contrib.sessions.backends.cache import SessionStore
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from blog import middleware
+from blog.middleware import ReplicaRoutingMiddleware
+from blog.models import Post
+from blog.routers import (
+    ReplicaRouter, read_database, replica_view, uses_replica
+)
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+
+
+@replica_view
+def read_view(request):
+    return HttpResponse(ReplicaRouter().db_for_read(Post) or "default")
+
+
+def write_view(request):
+    return HttpResponse(ReplicaRouter().db_for_write(Post))
+
+
+class Client:
+    """Прогоняет запросы через middleware с общей сессией."""
+
+    def __init__(self):
+        self.session = SessionStore()
+        self.factory = RequestFactory()
+
+    def request(self, method, view):
+        request = getattr(self.factory, method)("/")
+        request.session = self.session
+
+        def get_response(request):
+            return (
+                mw.process_view(request, view, (), {}) or view(request)
+            )
+
+        mw = ReplicaRoutingMiddleware(get_response)
+        return mw(request).content.decode()
+
+
+def test_read_only_views_use_replica():
+    client = Client()
+    assert client.request("get", read_view) == "replica_0"
+    assert client.request("get", write_view) == "default"
+    assert client.request("post", read_view) == "default"
+    assert read_database.get() is None
+
+
+def test_session_sticks_to_primary_after_write(monkeypatch):
+    client = Client()
+    monkeypatch.setattr(middleware, "time", lambda: 1000.0)
+    client.request("post", write_view)
+    assert client.request("get", read_view) == "default"
+
+    monkeypatch.setattr(
+        middleware, "time",
+        lambda: 1001.0 + middleware.PRIMARY_STICKY_SECONDS
+    )
+    assert client.request("get", read_view) == "replica_0"
+
+
+def test_no_replicas_reads_primary(settings):
+    settings.DATABASE_REPLICAS = []
+    assert Client().request("get", read_view) == "default"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("/", True),
+        ("/posts/1/", True),
+        ("/category/slug/", True),
+        ("/profile/name/", True),
+        ("/pages/about/", True),
+        ("/posts/create/", False),
+        ("/posts/1/comment/", False),
+    ],
+)
+def test_views_marked_for_replica(url, expected):
+    assert uses_replica(resolve(url).func) is expected
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_feed_reads_replica_until_write(
+        settings, user_client, mixer, user, published_category
+):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category
+
+    settings.DATABASE_REPLICAS = ["replica"]
+    primary_post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    author = get_user_model().objects.using("replica").create(
+        username="replica_author"
+    )
+    category = Category.objects.using("replica").create(
+        title="Реплика", slug="replica", is_published=True
+    )
+    # Другой pk: карточки публикаций кэшируются по pk.
+    Post.objects.using("replica").create(
+        pk=primary_post.pk + 1, title="Только на реплике", text="Текст", excerpt="Текст",
+        author=author, category=category, is_published=True,
+        pub_date=timezone.now(),
+    )
+
+    content = user_client.get("/").content.decode()
+    assert "Только на реплике" in content
+    assert primary_post.title not in content
+
+    response = user_client.post(
+        f"/posts/{primary_post.id}/comment/", data={"text": "Комментарий"}
+    )
+    assert response.status_code == 302
+
+    content = user_client.get("/").content.decode()
+    assert "Только на реплике" not in content
+    assert primary_post.title in content
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import common, scheduler
+from blog.cache import feed_page_cache
+from blog.scheduler import get_publication_moment, publication_scheduler
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def no_background_threads(settings):
+    settings.PUBLICATION_TIMER = False
+    settings.TASK_QUEUE_WORKERS = 0
+
+
+@pytest.fixture
+def future_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(days=2),
+    )
+
+
+def test_next_publication_is_local_midnight(future_post):
+    assert publication_scheduler.get_next_at() == get_publication_moment(
+        future_post.pub_date
+    )
+
+
+def test_reschedule_follows_post_changes(
+        future_post, django_capture_on_commit_callbacks
+):
+    publication_scheduler.get_next_at()
+    with django_capture_on_commit_callbacks(execute=True):
+        future_post.delete()
+    assert publication_scheduler.get_next_at() is None
+
+
+def test_past_next_publication_is_recomputed(
+        monkeypatch, mixer, future_post
+):
+    later_post = mixer.blend(
+        "blog.Post",
+        author=future_post.author,
+        category=future_post.category,
+        is_published=True,
+        pub_date=future_post.pub_date + timedelta(days=3),
+    )
+    publication_scheduler.get_next_at()
+
+    moment = get_publication_moment(future_post.pub_date)
+    monkeypatch.setattr(common, "now", lambda: moment + timedelta(seconds=1))
+    monkeypatch.setattr(scheduler, "now", lambda: moment + timedelta(seconds=1))
+
+    assert publication_scheduler.get_next_at() == get_publication_moment(
+        later_post.pub_date
+    )
+
+
+def test_run_due_fires_when_post_becomes_visible(monkeypatch, future_post):
+    assert publication_scheduler.run_due() == []
+    versions = feed_page_cache.get_versions("index")
+
+    moment = get_publication_moment(future_post.pub_date)
+    monkeypatch.setattr(common, "now", lambda: moment + timedelta(seconds=1))
+
+    assert publication_scheduler.run_due() == [future_post.id]
+    assert feed_page_cache.get_versions("index") != versions
+    assert publication_scheduler.run_due() == []
+
+
+def test_admin_schedule_lists_upcoming_posts(admin_client, future_post):
+    response = admin_client.get("/admin/blog/post/schedule/")
+    assert response.status_code == 200
+    assert future_post.title in response.content.decode("utf-8")
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.search import get_search_backend
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    published_location.name = "Калининград"
+    published_location.save()
+    past = timezone.now() - timedelta(days=1)
+    return {
+        "title": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=past,
+            title="Маяки побережья", text="Заметки о путешествии.",
+        ),
+        "text": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=past,
+            title="Путевые заметки", text="По дороге видели старые маяки.",
+        ),
+        "location": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location, is_published=True, pub_date=past,
+            title="Без ключевых слов", text="Просто текст.",
+        ),
+        "hidden": mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=False, pub_date=past,
+            title="Скрытые маяки", text="Не должно находиться.",
+        ),
+    }
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_title_match_ranks_first(client, posts):
+    assert _found(client, "маяки") == [posts["title"].id, posts["text"].id]
+
+
+def test_location_name_is_indexed(client, posts):
+    assert _found(client, "калининград") == [posts["location"].id]
+
+
+def test_index_follows_edit_and_delete(client, posts):
+    post = posts["text"]
+    post.text = "Теперь про лес."
+    post.save()
+    assert _found(client, "маяки") == [posts["title"].id]
+
+    posts["title"].delete()
+    assert _found(client, "маяки") == []
+    assert get_search_backend().search("лес") == [post.id]
+
+
+def test_query_syntax_is_escaped(client, posts):
+    assert _found(client, 'маяки"*(:') == [
+        posts["title"].id, posts["text"].id
+    ]
+
+
+def test_location_rename_is_reindexed_in_background(
+        settings, client, posts, published_location,
+        django_capture_on_commit_callbacks
+):
+    from blog.queue import task_queue
+
+    settings.TASK_QUEUE_WORKERS = 0
+    with django_capture_on_commit_callbacks(execute=True):
+        published_location.name = "Светлогорск"
+        published_location.save()
+    assert _found(client, "светлогорск") == []
+
+    task_queue.work(burst=True)
+    assert _found(client, "светлогорск") == [posts["location"].id]
@@ -0,0 +1,45 @@
+import pytest
+from django.conf import settings as django_settings
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.fixture
+def file_connection(tmp_path, django_db_blocker):
+    connection = DatabaseWrapper({
+        **django_settings.DATABASES["default"],
+        "NAME": str(tmp_path / "profile.sqlite3"),
+        "TIME_ZONE": None,
+        "AUTOCOMMIT": True,
+        "ATOMIC_REQUESTS": False,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {},
+    }, alias="profile")
+    with django_db_blocker.unblock():
+        yield connection
+        connection.close()
+
+
+def _pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_pragmas_applied_on_connect(settings, file_connection):
+    settings.SQLITE_PRAGMAS = settings.DATABASE_PROFILES["production"][
+        "PRAGMAS"
+    ]
+    assert _pragma(file_connection, "journal_mode") == "wal"
+    assert _pragma(file_connection, "busy_timeout") == 20000
+    assert _pragma(file_connection, "synchronous") == 1
+
+
+def test_default_profile_keeps_sqlite_defaults(settings, file_connection):
+    settings.SQLITE_PRAGMAS = {}
+    assert _pragma(file_connection, "journal_mode") == "delete"
+
+
+def test_production_profile_keeps_connections():
+    production = django_settings.DATABASE_PROFILES["production"]
+    assert production["CONN_MAX_AGE"] > 0
+    assert production["OPTIONS"]["timeout"] > 0
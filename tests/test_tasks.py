@@ -0,0 +1,83 @@
+import pytest
+from django.core import mail
+
+from blog.models import AuthorStats, Comment, Post
+from blog.queue import Job, SQLiteBackend, TaskQueue, task_queue
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def no_worker_threads(settings):
+    settings.TASK_QUEUE_WORKERS = 0
+
+
+def test_failed_job_is_retried_then_buried(monkeypatch, settings, tmp_path):
+    monkeypatch.setattr("blog.queue.TASK_RETRY_DELAY", 0)
+    settings.TASK_QUEUE_BACKEND = "sqlite"
+    settings.TASK_QUEUE_PATH = tmp_path / "tasks.sqlite3"
+    queue = TaskQueue()
+    calls = []
+
+    @queue.register
+    def flaky(value):
+        calls.append(value)
+        raise ValueError(value)
+
+    queue.push(Job(f"{__name__}.flaky", [1]))
+    queue.work(burst=True)
+
+    assert calls == [1, 1, 1]
+    stats = queue.stats()
+    assert stats["retried"] == 2
+    assert stats["failed"] == 1
+    assert stats["pending"] == 0
+    error = queue.backend.execute(
+        f"SELECT error FROM {SQLiteBackend.table}"
+    ).fetchone()[0]
+    assert "ValueError" in error
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    path = tmp_path / "tasks.sqlite3"
+    SQLiteBackend(path).push(Job("blog.tasks.send_email", ["a"]))
+    job = SQLiteBackend(path).pop(timeout=0)
+    assert job.name == "blog.tasks.send_email"
+    assert job.args == ["a"]
+
+
+def test_password_reset_mail_is_queued(
+        client, user, django_capture_on_commit_callbacks
+):
+    user.email = "user@example.com"
+    user.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/auth/password_reset/", data={"email": user.email})
+    assert mail.outbox == []
+
+    task_queue.work(burst=True)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+
+
+def test_delete_post_removes_comments_in_background(
+        user_client, mixer, user, another_user, published_category,
+        django_assert_max_num_queries, django_capture_on_commit_callbacks
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    mixer.cycle(10).blend("blog.Comment", post=post, author=user)
+    mixer.cycle(10).blend("blog.Comment", post=post, author=another_user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_max_num_queries(15):
+            user_client.post(f"/posts/{post.id}/delete/")
+
+    assert not Post.objects.filter(pk=post.pk).exists()
+    assert Comment.objects.count() == 20
+
+    task_queue.work(burst=True)
+    assert not Comment.objects.exists()
+    assert not AuthorStats.objects.filter(comments_count__gt=0).exists()
+
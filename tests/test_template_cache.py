@@ -0,0 +1,52 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.template.loader import render_to_string
+from django.template.loaders.filesystem import Loader
+
+from blog.template_cache import precompile_templates
+
+
+@pytest.fixture
+def production_templates(settings):
+    profile = settings.TEMPLATE_PROFILES["production"]
+    template = settings.TEMPLATES[0]
+    settings.TEMPLATES = [{
+        **template,
+        "APP_DIRS": profile["APP_DIRS"],
+        "OPTIONS": {**template["OPTIONS"], **profile["OPTIONS"]},
+    }]
+    return engines["django"].engine
+
+
+def test_precompiled_templates_are_not_read_again(
+        production_templates, monkeypatch
+):
+    total, errors = precompile_templates()
+    assert not errors
+    cache = production_templates.template_loaders[0].get_template_cache
+    assert total == len(cache)
+    assert {"base.html", "blog/index.html", "includes/post_card.html"} <= (
+        set(cache)
+    )
+
+    def fail(self, origin):
+        raise AssertionError(f"Шаблон {origin.name} прочитан повторно")
+
+    monkeypatch.setattr(Loader, "get_contents", fail)
+    render_to_string("pages/about.html")
+
+
+def test_compile_command_reports_errors(settings, tmp_path):
+    (tmp_path / "broken.html").write_text("{% if %}", encoding="utf-8")
+    template = settings.TEMPLATES[0]
+    settings.TEMPLATES = [{**template, "DIRS": [*template["DIRS"], tmp_path]}]
+    with pytest.raises(CommandError):
+        call_command("compile_templates", stderr=StringIO())
+
+    settings.TEMPLATES = [template]
+    out = StringIO()
+    call_command("compile_templates", stdout=out)
+    assert "Разобрано шаблонов" in out.getvalue()
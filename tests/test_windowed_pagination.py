@@ -0,0 +1,105 @@
+import re
+
+import pytest
+from django.core.paginator import EmptyPage
+
+from blog.models import Post
+from blog.paginators import WindowedPaginator, estimate_count
+from blog.views import IndexView
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 120
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=(i % 4 != 0 for i in range(N_POSTS)),
+    )
+
+
+def _page_links(content):
+    return re.findall(r'class="page-link"[^>]*>\s*([^<\s]+)\s*<', content)
+
+
+def test_feed_renders_window_of_page_links(client, many_posts):
+    # 90 опубликованных по 10 на странице — 9 страниц.
+    content = client.get("/").content.decode("utf-8")
+    assert _page_links(content) == [
+        "1", "2", "3", "…", "9", ">>", "Последняя",
+    ]
+    content = client.get("/?page=6").content.decode("utf-8")
+    assert _page_links(content) == [
+        "Первая", "1", "…", "4", "5", "6", "7", "8", "9", ">>", "Последняя",
+    ]
+
+
+def test_estimated_paginator_corrects_count_at_the_end(many_posts):
+    paginator = WindowedPaginator(
+        Post.objects.order_by("id"), 10,
+        estimate_count=True, estimate_sample=20
+    )
+    assert paginator.count >= N_POSTS
+    assert paginator.estimated
+
+    assert paginator.page(2).has_next()
+    last = paginator.page(N_POSTS // 10)
+    assert len(last) == 10
+    assert not last.has_next()
+    assert paginator.count == N_POSTS
+    with pytest.raises(EmptyPage):
+        paginator.page(N_POSTS // 10 + 5)
+
+
+def test_estimate_uses_sampled_share_of_filtered_rows(many_posts):
+    published = Post.objects.filter(is_published=True)
+    estimate = estimate_count(published, sample_size=40)
+    total = estimate_count(Post.objects.all(), sample_size=40)
+    assert estimate == round(total * 30 / 40)
+    # Маленькой таблице оценка не нужна.
+    assert estimate_count(published, sample_size=N_POSTS + 1) is None
+
+
+def test_feed_in_estimated_mode(monkeypatch, client, many_posts):
+    monkeypatch.setattr(IndexView, "estimate_count", True)
+    response = client.get("/?page=2")
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == 10
+
+
+def test_overestimated_last_page_falls_back_to_exact_count(
+        monkeypatch, client, many_posts
+):
+    # Оценка втрое больше 90 опубликованных: «Последняя» ведёт на 27-ю.
+    monkeypatch.setattr(IndexView, "estimate_count", True)
+    monkeypatch.setattr(
+        "blog.paginators.estimate_count", lambda *args: 270
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert 'page=27">' in content
+
+    response = client.get("/?page=27")
+    assert response.status_code == 200
+    page = response.context["page_obj"]
+    assert page.number == 9
+    assert not page.has_next()
+    assert client.get("/?page=28").status_code == 404
+
+
+def test_overestimated_cached_count_is_corrected(monkeypatch, many_posts):
+    from blog.counts import CachedCountPaginator, feed_count_cache
+
+    monkeypatch.setattr(
+        "blog.counts.estimate_count", lambda *args: 270
+    )
+    published = Post.objects.filter(is_published=True).order_by("-id")
+    paginator = CachedCountPaginator(
+        published, 10, count_scope="index", count_threshold=100
+    )
+    assert paginator.num_pages == 27
+    assert paginator.page(27).number == 9
+    assert feed_count_cache.get(paginator.count_key) == 90